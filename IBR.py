@@ -1,21 +1,28 @@
 import copy
+from contextlib import nullcontext
 
 import numpy as np
 from Player import IBRPlayer
 from best_response import verify_nash
+from br_store import game_fingerprint
+from parallel import BestResponseExecutor
 
 
 def iterated_best_response(monfg, u_tpl, epsilon=0., max_iter=1000, init_joint_strategy=None, variant='alternating',
-                           global_opt=False, verify=True, seed=None):
+                           global_opt=False, verify=True, seed=None, parallel=None, max_workers=None,
+                           gap_threshold=None, schedule=None, continuous=False, store=None, fingerprint=None):
     """Execute the iterated best response algorithm on a given MONFG and utility functions.
 
     There are two variants of the iterated best response algorithm implemented, a simultaneous and alternating variant.
     These are not equivalent in general. In the simultaneous variant, all players calculate their best-response
     strategy simultaneously. The alternating variant does it by alternating.
 
+    Every iteration, the Nash gap is estimated as the largest utility any player gained from their best response over
+    their current strategy. This reuses the utilities from the convergence check and is logged with the joint strategy.
+
     Note:
         At this point in time, the algorithm does not find cycles and will continue to execute until the maximum number
-        of iterations is reached.
+        of iterations is reached, unless a gap threshold is given.
 
     Args:
         monfg (List[ndarray]): A list of payoff matrices representing the MONFG.
@@ -29,16 +36,36 @@ def iterated_best_response(monfg, u_tpl, epsilon=0., max_iter=1000, init_joint_s
         verify (bool, optional): Verify if a converged joint strategy is a Nash equilibrium. When set to true, this uses
             a global optimiser and might be computationally expensive. (Default value = True)
         seed (int, optional): The initial seed for the random number generator. (Default value = None)
+        parallel (str, optional): Compute the best responses of the simultaneous variant concurrently, using either
+            'thread' or 'process' workers. The process workers require picklable utility functions.
+            (Default value = None)
+        max_workers (int, optional): The number of parallel workers. Defaults to one per player. (Default value = None)
+        gap_threshold (float, optional): Stop as soon as the estimated Nash gap drops to this threshold.
+            (Default value = None)
+        schedule (OptimiserSchedule, optional): A schedule that decides per iteration whether to use a global
+            optimiser. When given, this overrides ``global_opt``. (Default value = None)
+        continuous (bool, optional): Search best responses directly in the continuous strategy spaces of the
+            bijections attached to the utility functions, which requires a pure-strategy-equivalent game such as the
+            polynomial or Bertrand pricing game. (Default value = False)
+        store (BestResponseStore, optional): A persistent store to look up and save best responses, which can be shared
+            with parallel workers and other runs. (Default value = None)
+        fingerprint (str, optional): The fingerprint of the game for the store. By default, it is computed with
+            :func:`br_store.game_fingerprint`. (Default value = None)
 
     Returns:
-        Tuple[bool, List[ndarray]]: Whether or not we reached a Nash equilibrium and the final joint strategy.
+        Tuple[bool, List[ndarray], List[List[float]]]: Whether or not we reached a Nash equilibrium, the final joint
+        strategy and a log. Each record in the log holds the iteration, the flattened joint strategy after the updates
+        and the estimated Nash gap.
 
     """
     rng = np.random.default_rng(seed=seed)
+    if store is not None and fingerprint is None:
+        fingerprint = game_fingerprint(monfg, u_tpl)
 
     player_actions = monfg[0].shape[:-1]  # Get the number of actions available to each player.
     players = []  # A list to hold all the players.
     joint_strategy = []  # A list to hold the current joint strategy.
+    log = []  # Initialise the log.
 
     for player, num_actions in enumerate(player_actions):  # Loop over all players to create a new IBRAgent object.
         u = u_tpl[player]
@@ -46,7 +73,8 @@ def iterated_best_response(monfg, u_tpl, epsilon=0., max_iter=1000, init_joint_s
         init_strategy = None
         if init_joint_strategy is not None:
             init_strategy = init_joint_strategy[player]
-        player = IBRPlayer(player, u, num_actions, payoff_matrix, init_strategy=init_strategy, rng=rng)
+        player = IBRPlayer(player, u, num_actions, payoff_matrix, init_strategy=init_strategy, rng=rng, store=store,
+                           fingerprint=fingerprint)
         players.append(player)
         joint_strategy.append(player.strategy)
 
@@ -62,22 +90,59 @@ def iterated_best_response(monfg, u_tpl, epsilon=0., max_iter=1000, init_joint_s
             """Show the strategy updates of other players for the alternating update."""
             return new_joint_strategy
 
-    for i in range(max_iter):
-        converged = True
-
-        for pid, player in enumerate(players):
-            done, br = player.update_strategy(update_strategy(), epsilon=epsilon, global_opt=global_opt)
-            new_joint_strategy[pid] = br  # Update the joint strategy.
-            if not done:
-                converged = False
-
-        if converged:  # If IBR converged, check if we can guarantee a Nash equilibrium.
-            if global_opt:  # If we used a global optimiser, it is guaranteed to be a Nash equilibrium.
-                nash_equilibrium = True
-            elif verify:  # Otherwise check if the user wanted to verify.
-                nash_equilibrium = verify_nash(monfg, u_tpl, joint_strategy, epsilon=epsilon)
-            break
-        else:
-            joint_strategy = copy.deepcopy(new_joint_strategy)  # Update the joint strategy.
-
-    return nash_equilibrium, joint_strategy
+    if variant == 'simultaneous' and parallel is not None:
+        executor_context = BestResponseExecutor(monfg, u_tpl, backend=parallel, max_workers=max_workers, store=store,
+                                                fingerprint=fingerprint)
+    else:
+        executor_context = nullcontext()
+
+    with executor_context as executor:
+        for i in range(max_iter):
+            converged = True
+
+            if schedule is None:
+                iteration_global_opt, vertex_check = global_opt, False
+            else:
+                iteration_global_opt, vertex_check = schedule.use_global(i), schedule.vertex_check
+
+            if executor is None:  # Lazily evaluated so the alternating variant sees each new best response.
+                results = (player.update_strategy(update_strategy(), epsilon=epsilon, global_opt=iteration_global_opt,
+                                                  vertex_check=vertex_check, continuous=continuous)
+                           for player in players)
+            else:
+                # All players respond to the same joint strategy, so the best responses can be computed at once.
+                joint_strategies = [joint_strategy] * len(players)
+                init_strats = [player.strategy for player in players]
+                brs = executor.best_responses(joint_strategies, init_strats, epsilon=epsilon,
+                                              global_opt=iteration_global_opt, vertex_check=vertex_check,
+                                              continuous=continuous)
+                results = [player.apply_best_response(br, player_joint_strategy, epsilon=epsilon)
+                           for player, br, player_joint_strategy in zip(players, brs, joint_strategies)]
+
+            for pid, (done, br) in enumerate(results):
+                new_joint_strategy[pid] = br  # Update the joint strategy.
+                if not done:
+                    converged = False
+
+            nash_gap = max(player.regret for player in players)
+            record = [i] + [item for strat in new_joint_strategy for item in strat] + [nash_gap]
+            log.append(record)
+            if schedule is not None:
+                schedule.update(nash_gap, iteration_global_opt)
+
+            if converged:  # If IBR converged, check if we can guarantee a Nash equilibrium.
+                if iteration_global_opt:  # If we used a global optimiser, it is guaranteed to be a Nash equilibrium.
+                    nash_equilibrium = True
+                elif verify:  # Otherwise check if the user wanted to verify.
+                    nash_equilibrium = verify_nash(monfg, u_tpl, joint_strategy, epsilon=epsilon, store=store,
+                                                   fingerprint=fingerprint)
+                break
+            elif gap_threshold is not None and nash_gap <= gap_threshold:  # The regrets precede this update.
+                if verify:
+                    nash_equilibrium = verify_nash(monfg, u_tpl, joint_strategy, epsilon=epsilon, store=store,
+                                                   fingerprint=fingerprint)
+                break
+            else:
+                joint_strategy = copy.deepcopy(new_joint_strategy)  # Update the joint strategy.
+
+    return nash_equilibrium, joint_strategy, log
@@ -1,23 +1,27 @@
 import numpy as np
 
-from best_response import calc_best_response, calc_utility_from_joint_strat
+from best_response import calc_best_response, calc_logit_response, calc_utility_from_joint_strat
 
 
 class Player:
     """A best-response player"""
 
-    def __init__(self, pid, u, num_actions, payoff_matrix, init_strategy=None, rng=None):
+    def __init__(self, pid, u, num_actions, payoff_matrix, init_strategy=None, rng=None, store=None, fingerprint=None):
         self.pid = pid
         self.u = u
+        self.store = store  # An optional BestResponseStore shared with other players, workers and runs.
+        self.fingerprint = fingerprint
         self.num_actions = num_actions
         self.payoff_matrix = payoff_matrix
         self.rng = rng if rng is not None else np.random.default_rng()
+        self.regret = np.inf  # The utility gained by the last best response, which is unknown at this point.
+        self.br_utility = None  # The utility of the last best response against the joint strategy it answered.
         if init_strategy is None:
             self.strategy = np.full(self.num_actions, 1 / self.num_actions)
         else:
             self.strategy = init_strategy
 
-    def update(self, joint_strategy, epsilon=0, global_opt=False):
+    def update(self, joint_strategy, epsilon=0, global_opt=False, vertex_check=False, continuous=False):
         """Update the strategy by calculating a best response to the other players' strategies.
 
         Args:
@@ -25,14 +29,33 @@ class Player:
             epsilon (float, optional): An optional parameter to allow for approximate Nash equilibria.
                 (Default value = 0)
             global_opt (bool, optional): Whether to use a global optimiser or a local one. (Default value = False)
+            vertex_check (bool, optional): Whether to fall back to a global optimiser when a local best response
+                is beaten by a pure strategy. (Default value = False)
+            continuous (bool, optional): Search the best response directly in the continuous strategy space of the
+                bijection attached to the utility function. (Default value = False)
 
         Returns:
             Tuple[bool, ndarray]: Whether the strategy has converged and the best response strategy.
 
         """
         br = calc_best_response(self.u, self.pid, self.payoff_matrix, joint_strategy, epsilon=epsilon,
-                                global_opt=global_opt, init_strat=self.strategy)
+                                global_opt=global_opt, init_strat=self.strategy, vertex_check=vertex_check,
+                                store=self.store, fingerprint=self.fingerprint, continuous=continuous)
+        return self.apply_best_response(br, joint_strategy, epsilon=epsilon)
 
+    def apply_best_response(self, br, joint_strategy, epsilon=0):
+        """Adopt a best response strategy that was calculated to the other players' strategies.
+
+        Args:
+            br (ndarray): The best response strategy.
+            joint_strategy (List[ndarray]): The joint strategy the best response was calculated for.
+            epsilon (float, optional): An optional parameter to allow for approximate Nash equilibria.
+                (Default value = 0)
+
+        Returns:
+            Tuple[bool, ndarray]: Whether the strategy has converged and the best response strategy.
+
+        """
         converged = self.check_converged(br, joint_strategy, epsilon=epsilon)
         if not converged:
             self.strategy = br
@@ -43,7 +66,9 @@ class Player:
 
         This works by comparing the performance of the old strategy and the new strategy to the current opponent
         strategies. If the old strategy performed as good (or better) in response, we don't have to change the strategy
-        and this player has (temporarily) converged.
+        and this player has (temporarily) converged. The utility gained by switching is stored as the player's regret,
+        which bounds how much the player can exploit the current opponent strategies. The utility of the new strategy
+        is kept as well, so that it can be compared against other strategies responding to the same opponents.
 
         Args:
             new_strat: The new best-response strategy.
@@ -56,18 +81,22 @@ class Player:
 
         """
         old_strat_utility = calc_utility_from_joint_strat(self.u, self.pid, self.payoff_matrix, joint_strat)
+        joint_strat = list(joint_strat)  # Don't leak the new strategy into the caller's joint strategy.
         joint_strat[self.pid] = new_strat
         new_strat_utility = calc_utility_from_joint_strat(self.u, self.pid, self.payoff_matrix, joint_strat)
+        self.regret = max(0., new_strat_utility - old_strat_utility)
+        self.br_utility = new_strat_utility
         return old_strat_utility + epsilon >= new_strat_utility
 
 
 class IBRPlayer(Player):
     """A player that learns a strategy using best-response iteration."""
 
-    def __init__(self, pid, u, num_actions, payoff_matrix, init_strategy=None, rng=None):
-        super().__init__(pid, u, num_actions, payoff_matrix, init_strategy=init_strategy, rng=rng)
+    def __init__(self, pid, u, num_actions, payoff_matrix, init_strategy=None, rng=None, store=None, fingerprint=None):
+        super().__init__(pid, u, num_actions, payoff_matrix, init_strategy=init_strategy, rng=rng, store=store,
+                         fingerprint=fingerprint)
 
-    def update_strategy(self, joint_strat, epsilon=0, global_opt=False):
+    def update_strategy(self, joint_strat, epsilon=0, global_opt=False, vertex_check=False, continuous=False):
         """Update the strategy by using the super class implementation.
 
         Args:
@@ -75,23 +104,32 @@ class IBRPlayer(Player):
             epsilon (float, optional): An optional parameter to allow for approximate Nash equilibria.
                 (Default value = 0)
             global_opt (bool, optional): Whether to use a global optimiser or a local one. (Default value = False)
+            vertex_check (bool, optional): Whether to fall back to a global optimiser when a local best response
+                is beaten by a pure strategy. (Default value = False)
+            continuous (bool, optional): Search the best response directly in the continuous strategy space of the
+                bijection attached to the utility function. (Default value = False)
 
         Returns:
             Tuple[bool, ndarray]: Whether the strategy has converged and the best response strategy.
 
         """
-        return super().update(joint_strat, epsilon=epsilon, global_opt=global_opt)
+        return super().update(joint_strat, epsilon=epsilon, global_opt=global_opt, vertex_check=vertex_check,
+                              continuous=continuous)
 
 
 class FPPlayer(Player):
     """A player that learns a strategy using the fictitious play algorithm."""
 
-    def __init__(self, pid, u, player_actions, payoff_matrix, init_strategy=None, rng=None):
+    def __init__(self, pid, u, player_actions, payoff_matrix, init_strategy=None, rng=None, expected_play=False,
+                 store=None, fingerprint=None):
         self.pid = pid
         self.player_actions = player_actions
         self.num_actions = player_actions[pid]
+        self.expected_play = expected_play
         self.empirical_strategies = [np.zeros(num_actions) for num_actions in player_actions]
-        super().__init__(pid, u, self.num_actions, payoff_matrix, init_strategy=init_strategy, rng=rng)
+        self.sampling_variances = [np.zeros(num_actions) for num_actions in player_actions]
+        super().__init__(pid, u, self.num_actions, payoff_matrix, init_strategy=init_strategy, rng=rng, store=store,
+                         fingerprint=fingerprint)
 
     def select_action(self):
         """Select an action using the current strategy.
@@ -102,11 +140,35 @@ class FPPlayer(Player):
         """
         return self.rng.choice(range(self.num_actions), p=self.strategy)
 
-    def calc_joint_strategy(self):
-        """Calculates the empirical joint strategy.
+    def play(self):
+        """Play the current strategy.
 
         Returns:
-            List[ndarray]: The joint strategy.
+            int | ndarray: A sampled action or, when using expected play, the full mixed strategy.
+
+        """
+        if self.expected_play:
+            return self.strategy
+        return self.select_action()
+
+    def observe(self, player, played):
+        """Observe what a player played and update their empirical strategy accordingly.
+
+        Args:
+            player (int): The player to update for.
+            played (int | ndarray): Their last action or, when using expected play, their last mixed strategy.
+
+        """
+        if self.expected_play:
+            self.update_empirical_mixed_strategy(player, played)
+        else:
+            self.update_empirical_strategy(player, played)
+
+    def calc_empirical_joint_strategy(self):
+        """Calculates the empirical joint strategy of all players, including this player.
+
+        Returns:
+            List[ndarray]: The empirical strategy of each player, which is uniform before anything was observed.
 
         """
         joint_strategy = []
@@ -119,23 +181,38 @@ class FPPlayer(Player):
                 strategy = player_actions / np.sum(player_actions)
             joint_strategy.append(strategy)
 
+        return joint_strategy
+
+    def calc_joint_strategy(self):
+        """Calculates the joint strategy to respond to, which is the empirical strategy of every opponent.
+
+        Returns:
+            List[ndarray]: The joint strategy.
+
+        """
+        joint_strategy = self.calc_empirical_joint_strategy()
         joint_strategy[self.pid] = self.strategy
         return joint_strategy
 
-    def update_strategy(self, epsilon=0, global_opt=False):
+    def update_strategy(self, epsilon=0, global_opt=False, vertex_check=False, continuous=False):
         """Updates the strategy of the player by calculating a best response to the empirical joint strategy.
 
         Args:
             epsilon (float, optional): An optional parameter to allow for approximate Nash equilibria.
                 (Default value = 0)
             global_opt (bool, optional): Whether to use a global optimiser or a local one. (Default value = False)
+            vertex_check (bool, optional): Whether to fall back to a global optimiser when a local best response
+                is beaten by a pure strategy. (Default value = False)
+            continuous (bool, optional): Search the best response directly in the continuous strategy space of the
+                bijection attached to the utility function. (Default value = False)
 
         Returns:
             Tuple[bool, ndarray]: Whether the strategy has converged and the best response strategy.
 
         """
         joint_strat = self.calc_joint_strategy()
-        return super().update(joint_strat, epsilon=epsilon, global_opt=global_opt)
+        return super().update(joint_strat, epsilon=epsilon, global_opt=global_opt, vertex_check=vertex_check,
+                              continuous=continuous)
 
     def update_empirical_strategy(self, player, action):
         """Update the empirical strategy of a player.
@@ -146,3 +223,74 @@ class FPPlayer(Player):
 
         """
         self.empirical_strategies[player][action] += 1
+
+    def update_empirical_mixed_strategy(self, player, strategy):
+        """Update the empirical strategy of a player with their full mixed strategy.
+
+        This is the expected update of :meth:`update_empirical_strategy`. We also keep track of the variance that
+        sampling an action from this strategy would have introduced.
+
+        Args:
+            player (int): The player to update for.
+            strategy (ndarray): Their last mixed strategy.
+
+        """
+        self.empirical_strategies[player] += strategy
+        self.sampling_variances[player] += strategy * (1 - strategy)
+
+    def calc_sampling_std(self):
+        """Calculate the standard deviation that sampled play would have on each empirical strategy.
+
+        Every sampled action is a categorical draw from the played strategy, so the variance of an empirical action
+        frequency after :math:`t` observations is the sum of the per-draw variances divided by :math:`t^2`.
+
+        Returns:
+            List[ndarray]: The standard deviation of each action's empirical probability, indexed by player.
+
+        """
+        sampling_std = []
+
+        for player_actions, variances in zip(self.empirical_strategies, self.sampling_variances):
+            past_actions = np.sum(player_actions)
+            if past_actions == 0:
+                std = np.zeros(len(variances))
+            else:
+                std = np.sqrt(variances) / past_actions
+            sampling_std.append(std)
+
+        return sampling_std
+
+
+class SmoothFPPlayer(FPPlayer):
+    """A player that learns a strategy using smooth fictitious play with logit responses."""
+
+    def __init__(self, pid, u, player_actions, payoff_matrix, temperature=0.1, init_strategy=None, rng=None,
+                 expected_play=False):
+        self.temperature = temperature
+        super().__init__(pid, u, player_actions, payoff_matrix, init_strategy=init_strategy, rng=rng,
+                         expected_play=expected_play)
+
+    def update_strategy(self, epsilon=0, global_opt=False, vertex_check=False, continuous=False):
+        """Updates the strategy of the player by calculating a logit response to the empirical joint strategy.
+
+        Note:
+            The logit response is always adopted, as it is the unique smoothed best response. The optimiser flags are
+            accepted for compatibility but have no effect.
+
+        Args:
+            epsilon (float, optional): An optional parameter to allow for approximate Nash equilibria.
+                (Default value = 0)
+            global_opt (bool, optional): Unused. (Default value = False)
+            vertex_check (bool, optional): Unused. (Default value = False)
+            continuous (bool, optional): Unused. (Default value = False)
+
+        Returns:
+            Tuple[bool, ndarray]: Whether the strategy has converged and the logit response strategy.
+
+        """
+        joint_strat = self.calc_joint_strategy()
+        response = calc_logit_response(self.u, self.pid, self.payoff_matrix, joint_strat,
+                                       temperature=self.temperature, init_strat=self.strategy)
+        converged = self.check_converged(response, joint_strat, epsilon=epsilon)
+        self.strategy = response
+        return converged, response
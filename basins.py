@@ -0,0 +1,209 @@
+import os
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+import numpy as np
+from scipy.stats import qmc
+
+from IBR import iterated_best_response
+from equilibrium_registry import EquilibriumRegistry
+from fictitious_play import fictitious_play
+from parallel import init_worker, worker_game
+from shared_game import SharedMONFG
+from strategy_bijections import BoxBijection
+
+BasinMap = namedtuple('BasinMap', ['starts', 'labels', 'basins'])
+
+
+def sample_unit_cube(dim, num_starts, method='grid', seed=None):
+    """Sample starting points in the unit cube.
+
+    Args:
+        dim (int): The dimension of the cube.
+        num_starts (int): The number of points. A grid rounds this up to the next power of ``dim``.
+        method (str, optional): Either a regular 'grid' of cell centres or a scrambled 'sobol' sequence.
+            (Default value = 'grid')
+        seed (int, optional): The seed for the scrambling of the Sobol sequence. (Default value = None)
+
+    Returns:
+        ndarray: The points, with one point on every row.
+
+    Raises:
+        ValueError: When the method is unknown.
+    """
+    if method == 'grid':
+        per_axis = int(np.ceil(num_starts ** (1 / dim) - 1e-9))
+        ticks = (np.arange(per_axis) + 0.5) / per_axis
+        return np.stack(np.meshgrid(*[ticks] * dim, indexing='ij'), axis=-1).reshape(-1, dim)
+    elif method == 'sobol':
+        return qmc.Sobol(dim, scramble=True, seed=seed).random(num_starts)
+    else:
+        raise ValueError(f'Unknown sampling method {method}, expected either grid or sobol')
+
+
+def starts_to_joint_strategies(starts, player_actions):
+    """Map points in the unit cube to joint strategies.
+
+    Each player's block of ``num_actions - 1`` dimensions is mapped to their simplex by stick breaking with a
+    :class:`strategy_bijections.BoxBijection`, so a grid or low-discrepancy set in the cube stays evenly spread over
+    the strategies. For games with two actions per player, this is the map to the one-simplex used by the experiments.
+
+    Args:
+        starts (ndarray): The points in the unit cube, with one point on every row.
+        player_actions (Tuple[int]): A tuple of actions indexed by player.
+
+    Returns:
+        List[ndarray]: The strategies of each player, with the strategy for every start on a row.
+    """
+    joint_strategies = []
+    start = 0
+    for num_actions in player_actions:
+        end = start + num_actions - 1
+        bijection = BoxBijection(np.zeros(num_actions - 1), np.ones(num_actions - 1))
+        joint_strategies.append(bijection.point_to_coord(starts[:, start:end]))
+        start = end
+    return joint_strategies
+
+
+def run_from_starts(monfg, u_tpl, init_joint_strategies, algorithm='IBR', max_iter=100, **kwargs):
+    """Run a learning algorithm from a batch of initial joint strategies.
+
+    Args:
+        monfg (List[ndarray]): An MONFG as a list of payoff matrices.
+        u_tpl (Tuple[callable]): A tuple of utility functions.
+        init_joint_strategies (List[ndarray]): The initial strategies of each player, with a start on every row.
+        algorithm (str, optional): The algorithm to use, either 'IBR' or 'FP'. (Default value = 'IBR')
+        max_iter (int, optional): The maximum number of iterations per run. (Default value = 100)
+        **kwargs: Further keyword arguments for the algorithm.
+
+    Returns:
+        ndarray: The final joint strategy of each run, flattened on a row.
+    """
+    if algorithm == 'FP':
+        run = fictitious_play
+    elif algorithm == 'IBR':
+        run = iterated_best_response
+    else:
+        raise NotImplementedError(f'Algorithm {algorithm}')
+
+    final_strategies = []
+    for init_joint_strategy in zip(*init_joint_strategies):
+        _, joint_strategy, _ = run(monfg, u_tpl, max_iter=max_iter, init_joint_strategy=list(init_joint_strategy),
+                                   verify=False, **kwargs)
+        final_strategies.append(np.concatenate(joint_strategy))
+    return np.array(final_strategies)
+
+
+def worker_run_from_starts(init_joint_strategies, **kwargs):
+    """Run a learning algorithm from a batch of starts in the game that was stored by :func:`parallel.init_worker`.
+
+    Args:
+        init_joint_strategies (List[ndarray]): The initial strategies of each player, with a start on every row.
+        **kwargs: The keyword arguments for :func:`run_from_starts`.
+
+    Returns:
+        ndarray: The final joint strategy of each run, flattened on a row.
+    """
+    monfg, u_tpl = worker_game()
+    return run_from_starts(monfg, u_tpl, init_joint_strategies, **kwargs)
+
+
+def map_basins(monfg, u_tpl, num_starts=100, method='grid', algorithm='IBR', max_iter=100, tol=1e-3, verify=True,
+               parallel=None, max_workers=None, batch_size=None, seed=None, registry=None, **kwargs):
+    """Map the basins of attraction of a learning algorithm in an MONFG.
+
+    The algorithm is run from a deliberate set of initial joint strategies, either a grid or a Sobol sequence, instead
+    of from random starts. Runs are split in batches that can be executed by parallel workers. The final joint
+    strategies are clustered by an :class:`equilibrium_registry.EquilibriumRegistry` and every cluster is verified to
+    be a Nash equilibrium once, rather than every run.
+
+    Note:
+        Fictitious play only warm starts the players' own strategies, as their beliefs start out empty. Its basins
+        therefore mostly reflect the first best responses.
+
+    Args:
+        monfg (List[ndarray]): An MONFG as a list of payoff matrices.
+        u_tpl (Tuple[callable]): A tuple of utility functions.
+        num_starts (int, optional): The number of initial joint strategies. (Default value = 100)
+        method (str, optional): How to choose the initial joint strategies, either 'grid' or 'sobol'.
+            (Default value = 'grid')
+        algorithm (str, optional): The algorithm to use, either 'IBR' or 'FP'. (Default value = 'IBR')
+        max_iter (int, optional): The maximum number of iterations per run. (Default value = 100)
+        tol (float, optional): The largest difference in action probabilities within a basin. (Default value = 1e-3)
+        verify (bool, optional): Verify whether the representative of every basin is a Nash equilibrium.
+            (Default value = True)
+        parallel (str, optional): Run the batches concurrently using either 'thread' or 'process' workers. The process
+            workers require picklable utility functions. (Default value = None)
+        max_workers (int, optional): The number of parallel workers. (Default value = None)
+        batch_size (int, optional): The number of runs per task. Defaults to an even split over the workers.
+            (Default value = None)
+        seed (int, optional): The seed for the Sobol sequence. (Default value = None)
+        registry (EquilibriumRegistry, optional): A registry of the same game to add the runs to, for instance from an
+            earlier call. By default, a new registry with tolerance ``tol`` is used. (Default value = None)
+        **kwargs: Further keyword arguments for the algorithm, such as ``variant`` or ``global_opt``.
+
+    Returns:
+        BasinMap: The initial joint strategies as points in the unit cube, the basin label of every start and a list
+        with the statistics of every basin. These are its label in the registry, its representative joint strategy,
+        the number and share of the starts in the basin, the mean and standard deviation of its final joint strategies
+        and, when verified, whether the representative is a Nash equilibrium. When the utility functions carry a
+        bijection, the representative is also given as a point in each player's continuous strategy space.
+    """
+    player_actions = monfg[0].shape[:-1]
+    dim = int(np.sum(player_actions)) - len(player_actions)
+    starts = sample_unit_cube(dim, num_starts, method=method, seed=seed)
+    init_joint_strategies = starts_to_joint_strategies(starts, player_actions)
+    run_kwargs = dict(kwargs, algorithm=algorithm, max_iter=max_iter)
+
+    if parallel is None:
+        final_strategies = run_from_starts(monfg, u_tpl, init_joint_strategies, **run_kwargs)
+    else:
+        if parallel == 'thread':
+            executor_cls = ThreadPoolExecutor
+            shared_game = None
+        elif parallel == 'process':
+            executor_cls = ProcessPoolExecutor
+            shared_game = SharedMONFG(monfg)
+        else:
+            raise ValueError(f'Unknown parallel backend {parallel}, expected either thread or process')
+
+        game = monfg if shared_game is None else shared_game
+        try:
+            with executor_cls(max_workers=max_workers, initializer=init_worker, initargs=(game, u_tpl)) as executor:
+                if batch_size is None:
+                    batch_size = int(np.ceil(len(starts) / (max_workers or os.cpu_count())))
+                futures = []
+                for batch_start in range(0, len(starts), batch_size):
+                    batch = [strategies[batch_start:batch_start + batch_size] for strategies in init_joint_strategies]
+                    futures.append(executor.submit(worker_run_from_starts, batch, **run_kwargs))
+                final_strategies = np.concatenate([future.result() for future in futures])
+        finally:
+            if shared_game is not None:
+                shared_game.close()
+
+    if registry is None:
+        registry = EquilibriumRegistry(player_actions, tol=tol)
+    labels = registry.add_many(final_strategies)
+    if verify:
+        registry.verify(monfg, u_tpl)
+
+    bijections = [getattr(u, 'bijection', None) for u in u_tpl]
+    basins = []
+
+    for label in np.unique(labels):
+        members = final_strategies[labels == label]
+        joint_strategy = registry.joint_strategy(label)
+        basin = {'label': int(label),
+                 'representative': joint_strategy,
+                 'count': len(members),
+                 'share': len(members) / len(final_strategies),
+                 'mean': np.mean(members, axis=0),
+                 'std': np.std(members, axis=0)}
+        if verify:
+            basin['nash'] = registry.nash[label]
+        if all(bijection is not None for bijection in bijections):
+            basin['points'] = [bijection.coord_to_point(strategy)
+                               for bijection, strategy in zip(bijections, joint_strategy)]
+        basins.append(basin)
+
+    return BasinMap(starts, labels, basins)
@@ -1,5 +1,6 @@
 from identity_game import identity_game
-from strategy_bijections import one_simplex_coord_to_point
+from kernels import jit
+from strategy_bijections import BoxBijection, one_simplex_coord_to_point, with_bijection
 
 
 def demand_x1(price, a):
@@ -150,6 +151,36 @@ def profit_y(price_x, price_y, sigma, gamma, n, m, a):
     return (price_y - m) * total_demand_y(price_x, price_y, sigma, gamma, n, a)
 
 
+@jit
+def bertrand_profits(price_x, price_y, sigma, gamma, n, m, a):
+    """Compute the profits for both products in a single pass.
+
+    This computes the same profits as :func:`profit_x` and :func:`profit_y`, but shares the subexpressions of the
+    demand functions. The prices may also be arrays, in which case the profits are computed for every pair of prices.
+
+    Args:
+        price_x (float | ndarray): The price for product x.
+        price_y (float | ndarray): The price for product y.
+        sigma (float): The elasticity of substitution between x and y.
+        gamma (float): The elasticity of demand for the composite good.
+        n (float): The number of type two customers.
+        m (float): The unit cost of production for each firm.
+        a (float): All factors affecting price other than demand.
+
+    Returns:
+        Tuple[float | ndarray, float | ndarray]: The profit for product x and the profit for product y.
+    """
+    price_x = price_x * 1.0  # Integer powers with a negative exponent are not defined in compiled code.
+    price_y = price_y * 1.0
+    sigma = sigma * 1.0
+    power_x = price_x ** (1 - sigma)
+    power_y = price_y ** (1 - sigma)
+    composite = n * (power_x + power_y) ** ((gamma - sigma) / (-1 + sigma))  # Shared by both type two demands.
+    demand_x = a - price_x + power_x / price_x * composite  # Use that price ** -sigma = price ** (1 - sigma) / price.
+    demand_y = a - price_y + power_y / price_y * composite
+    return (price_x - m) * demand_x, (price_y - m) * demand_y
+
+
 def setup_bertrand_pricing_game(min_price, max_price, sigma, gamma, n, m, a):
     """Set up a Bertrand price game.
 
@@ -162,6 +193,11 @@ def setup_bertrand_pricing_game(min_price, max_price, sigma, gamma, n, m, a):
         m (float): The unit cost of production for each firm.
         a (float): All factors affecting price other than demand.
 
+    Note:
+        The utility functions also accept a batch of payoff vectors stacked along the first axes, in which case they
+        return the utility of each payoff vector. Every utility function carries the bijection of its player's price, so
+        best responses can be searched directly in the price interval.
+
     Returns:
         List[ndarray], Tuple[callable]: The MONFG and a tuple of utility functions.
     """
@@ -169,16 +205,17 @@ def setup_bertrand_pricing_game(min_price, max_price, sigma, gamma, n, m, a):
     monfg = identity_game(player_actions)
 
     def u1(payoff):
-        price_x = one_simplex_coord_to_point(payoff[0:2], min_price, max_price)
-        price_y = one_simplex_coord_to_point(payoff[2:4], min_price, max_price)
-        return profit_x(price_x, price_y, sigma, gamma, n, m, a)
+        price_x = one_simplex_coord_to_point(payoff[..., 0:2], min_price, max_price)
+        price_y = one_simplex_coord_to_point(payoff[..., 2:4], min_price, max_price)
+        return bertrand_profits(price_x, price_y, sigma, gamma, n, m, a)[0]
 
     def u2(payoff):
-        price_x = one_simplex_coord_to_point(payoff[0:2], min_price, max_price)
-        price_y = one_simplex_coord_to_point(payoff[2:4], min_price, max_price)
-        return profit_y(price_x, price_y, sigma, gamma, n, m, a)
+        price_x = one_simplex_coord_to_point(payoff[..., 0:2], min_price, max_price)
+        price_y = one_simplex_coord_to_point(payoff[..., 2:4], min_price, max_price)
+        return bertrand_profits(price_x, price_y, sigma, gamma, n, m, a)[1]
 
-    u_tpl = (u1, u2)
+    bijection = BoxBijection([min_price], [max_price])
+    u_tpl = (with_bijection(u1, bijection), with_bijection(u2, bijection))
     return monfg, u_tpl
 
 
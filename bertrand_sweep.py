@@ -0,0 +1,188 @@
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from IBR import iterated_best_response
+from bertrand_pricing_game import setup_bertrand_pricing_game
+from fictitious_play import fictitious_play
+from strategy_bijections import one_simplex_coord_to_point, one_simplex_point_to_coord
+
+DEFAULT_PARAMS = {'sigma': 3, 'gamma': 2, 'n': 2700, 'm': 1, 'a': 50}
+
+
+def add_equilibrium(equilibria, prices, tol=1e-2):
+    """Add the prices of an equilibrium to a list unless a nearby equilibrium is already in there.
+
+    Args:
+        equilibria (List[Tuple[float]]): A list of equilibrium prices.
+        prices (Tuple[float]): The prices of the new equilibrium.
+        tol (float, optional): The largest difference in price to still consider two equilibria equal.
+            (Default value = 1e-2)
+    """
+    for equilibrium in equilibria:
+        if np.max(np.abs(np.array(equilibrium) - np.array(prices))) <= tol:
+            return
+    equilibria.append(prices)
+
+
+def solve_point(params, init_prices, min_price, max_price, algorithm='IBR', max_iter=100, global_opt=True, tol=1e-2):
+    """Find the equilibria of a Bertrand pricing game for one set of parameters.
+
+    Note:
+        The game is set up inside this function so that it can run in a worker process without pickling the utility
+        functions. Fictitious play only warm starts the players' own strategies, as their beliefs start out empty.
+
+    Args:
+        params (Dict[str, float]): The parameters sigma, gamma, n, m and a of the game.
+        init_prices (List[Tuple[float]]): The initial prices to start a run from.
+        min_price (float): The minimum price in the game.
+        max_price (float): The maximum price in the game.
+        algorithm (str, optional): The algorithm to use, either 'IBR' or 'FP'. (Default value = 'IBR')
+        max_iter (int, optional): The maximum number of iterations per run. (Default value = 100)
+        global_opt (bool, optional): Whether to use a global optimiser or a local one. (Default value = True)
+        tol (float, optional): The largest difference in price to still consider two equilibria equal.
+            (Default value = 1e-2)
+
+    Returns:
+        List[Tuple[float]]: The prices of every distinct equilibrium that was reached.
+    """
+    monfg, u_tpl = setup_bertrand_pricing_game(min_price, max_price, **params)
+    equilibria = []
+
+    for prices in init_prices:
+        init_joint_strategy = [one_simplex_point_to_coord(price, min_price, max_price) for price in prices]
+        if algorithm == 'FP':
+            ne, joint_strat, _ = fictitious_play(monfg, u_tpl, max_iter=max_iter,
+                                                 init_joint_strategy=init_joint_strategy, variant='simultaneous',
+                                                 global_opt=global_opt)
+        elif algorithm == 'IBR':
+            ne, joint_strat, _ = iterated_best_response(monfg, u_tpl, max_iter=max_iter,
+                                                        init_joint_strategy=init_joint_strategy,
+                                                        variant='simultaneous', global_opt=global_opt)
+        else:
+            raise NotImplementedError(f'Algorithm {algorithm}')
+
+        if ne:
+            prices = tuple(one_simplex_coord_to_point(strat, min_price, max_price) for strat in joint_strat)
+            add_equilibrium(equilibria, prices, tol=tol)
+
+    return equilibria
+
+
+def sweep_bertrand_pricing_game(grid, min_price=1, max_price=30, cold_starts=None, algorithm='IBR', max_iter=100,
+                                global_opt=True, tol=1e-2, max_workers=None):
+    """Find the equilibria of the Bertrand pricing game over a grid of parameters.
+
+    The grid is swept in waves of points whose indices have the same sum. Every point in a wave only depends on points
+    from the previous wave, so all points in a wave are solved in parallel. Each point is warm started from the
+    equilibria of its neighbours one step back along every axis and is always cold started as well, so equilibria that
+    the neighbours did not reach can still be found.
+
+    Note:
+        A grid over a single parameter has only one point per wave, which leaves nothing to solve in parallel. Such a
+        grid is solved in one go from the cold starts only. Use :func:`continue_bertrand_pricing_game` to warm start
+        along a single parameter instead.
+
+    Args:
+        grid (Dict[str, List[float]]): The values to sweep for any of the parameters sigma, gamma, n, m and a.
+            Parameters which are not in the grid keep the values of :func:`experiments.run_experiments`.
+        min_price (float, optional): The minimum price in the game. (Default value = 1)
+        max_price (float, optional): The maximum price in the game. (Default value = 30)
+        cold_starts (List[Tuple[float]], optional): The initial prices for cold starts. By default, runs start from both
+            asymmetric corners and the centre of the price space. (Default value = None)
+        algorithm (str, optional): The algorithm to use, either 'IBR' or 'FP'. (Default value = 'IBR')
+        max_iter (int, optional): The maximum number of iterations per run. (Default value = 100)
+        global_opt (bool, optional): Whether to use a global optimiser or a local one. (Default value = True)
+        tol (float, optional): The largest difference in price to still consider two equilibria equal.
+            (Default value = 1e-2)
+        max_workers (int, optional): The number of worker processes. (Default value = None)
+
+    Returns:
+        List[Dict]: For every point of the grid, in row-major order, its parameters and a list of equilibrium prices
+        under the key 'equilibria'.
+
+    Raises:
+        ValueError: When the grid contains an unknown parameter.
+    """
+    unknown = set(grid) - set(DEFAULT_PARAMS)
+    if unknown:
+        raise ValueError(f'Unknown parameters {unknown}, expected a subset of {tuple(DEFAULT_PARAMS)}')
+
+    if cold_starts is None:
+        mid_price = (min_price + max_price) / 2
+        cold_starts = [(min_price, max_price), (max_price, min_price), (mid_price, mid_price)]
+
+    names = list(grid)
+    shape = tuple(len(grid[name]) for name in names)
+    points = {}
+
+    if len(shape) > 1:
+        waves = [[idx for idx in np.ndindex(shape) if sum(idx) == wave] for wave in range(sum(shape) - len(shape) + 1)]
+    else:
+        waves = [list(np.ndindex(shape))]  # Solve every point at once, as waves would run one point at a time.
+
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        for wave in waves:
+            futures = {}
+
+            for idx in wave:
+                params = dict(DEFAULT_PARAMS, **{name: grid[name][i] for name, i in zip(names, idx)})
+                init_prices = []
+                for axis in range(len(shape)):  # Collect the equilibria of the neighbours in the previous wave.
+                    neighbour = idx[:axis] + (idx[axis] - 1,) + idx[axis + 1:]
+                    if neighbour in points:
+                        for prices in points[neighbour]['equilibria']:
+                            add_equilibrium(init_prices, prices, tol=tol)
+
+                for prices in cold_starts:  # Cold starts can reach equilibria that none of the neighbours have.
+                    add_equilibrium(init_prices, prices, tol=tol)
+
+                futures[idx] = (params, executor.submit(solve_point, params, init_prices, min_price, max_price,
+                                                        algorithm=algorithm, max_iter=max_iter, global_opt=global_opt,
+                                                        tol=tol))
+
+            for idx, (params, future) in futures.items():
+                points[idx] = dict(params, equilibria=future.result())
+
+    return [points[idx] for idx in np.ndindex(shape)]
+
+
+def continue_bertrand_pricing_game(path, min_price=1, max_price=30, cold_starts=None, algorithm='IBR', max_iter=100,
+                                   global_opt=True, tol=1e-2):
+    """Follow the equilibria of the Bertrand pricing game along a continuation path of parameters.
+
+    Every point on the path is warm started from the equilibria of the previous point, so the path should take small
+    steps in parameter space. The first point, or any point after one without equilibria, is cold started.
+
+    Args:
+        path (List[Dict[str, float]]): The parameters at each point of the path. Missing parameters keep the values of
+            :func:`experiments.run_experiments`.
+        min_price (float, optional): The minimum price in the game. (Default value = 1)
+        max_price (float, optional): The maximum price in the game. (Default value = 30)
+        cold_starts (List[Tuple[float]], optional): The initial prices for cold starts. By default, runs start from both
+            asymmetric corners and the centre of the price space. (Default value = None)
+        algorithm (str, optional): The algorithm to use, either 'IBR' or 'FP'. (Default value = 'IBR')
+        max_iter (int, optional): The maximum number of iterations per run. (Default value = 100)
+        global_opt (bool, optional): Whether to use a global optimiser or a local one. (Default value = True)
+        tol (float, optional): The largest difference in price to still consider two equilibria equal.
+            (Default value = 1e-2)
+
+    Returns:
+        List[Dict]: For every point on the path, its parameters and a list of equilibrium prices under the key
+        'equilibria'.
+    """
+    if cold_starts is None:
+        mid_price = (min_price + max_price) / 2
+        cold_starts = [(min_price, max_price), (max_price, min_price), (mid_price, mid_price)]
+
+    points = []
+    init_prices = cold_starts
+
+    for point_params in path:
+        params = dict(DEFAULT_PARAMS, **point_params)
+        equilibria = solve_point(params, init_prices, min_price, max_price, algorithm=algorithm, max_iter=max_iter,
+                                 global_opt=global_opt, tol=tol)
+        points.append(dict(params, equilibria=equilibria))
+        init_prices = equilibria if equilibria else cold_starts
+
+    return points
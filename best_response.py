@@ -1,6 +1,10 @@
+from functools import lru_cache
+
 import numpy as np
 import scipy.optimize as scopt
 
+from kernels import expected_vector, two_player_expected_returns
+from utils.learners import softmax_policy
 from utils.strategies import normalise_strat
 
 
@@ -19,13 +23,36 @@ def objective(strategy, expected_returns, u):
         float: The value on the objective with the provided arguments.
 
     """
-    strategy = normalise_strat(strategy)
-    expected_vec = strategy @ expected_returns  # The expected vector of the strategy applied to the expected returns.
+    expected_vec = expected_vector(strategy, expected_returns)  # The normalised strategy applied to the returns.
     utility = u(expected_vec)
     return utility
 
 
-def optimise_policy(expected_returns, u, epsilon=0, global_opt=False, init_strat=None, guesses=1):
+def objective_gradient(strategy, expected_returns, u):
+    """The gradient of the objective function with respect to the strategy.
+
+    This requires the utility function to provide its exact gradient through a ``gradient`` attribute, as the utilities
+    from :func:`symbolic_utility.make_symbolic_utility` do. The normalisation in :func:`objective` is taken into
+    account.
+
+    Args:
+        strategy (ndarray) The current estimate for the best response strategy.
+        expected_returns (ndarray): The expected returns given all other players' strategies.
+        u (callable): The utility function of this agent.
+
+    Returns:
+        ndarray: The gradient of the objective function.
+
+    """
+    total = np.sum(strategy)
+    strategy = normalise_strat(strategy)
+    gradient = expected_returns @ u.gradient(strategy @ expected_returns)
+    if total > 0:
+        gradient = (gradient - gradient @ strategy) / total  # The chain rule through the normalisation.
+    return gradient
+
+
+def optimise_policy(expected_returns, u, epsilon=0, global_opt=False, init_strat=None, guesses=1, continuous=False):
     """Optimise a policy given a utility function.
 
     When setting ``global_opt=True``, this will optimise the function using the SHGO algorithm. The algorithm is proven
@@ -34,7 +61,8 @@ def optimise_policy(expected_returns, u, epsilon=0, global_opt=False, init_strat
     method as there is a bug in the default method and sobol has shown more reliable in practice.
 
     When using a local optimiser, the function is only guaranteed to find a local optimum. By default it will use
-    Sequential Least Squares Programming (SLSQP).
+    Sequential Least Squares Programming (SLSQP). When the utility function has a ``gradient`` attribute, both
+    optimisers use the exact gradient of the objective instead of finite differences.
 
     References:
         .. [1] Endres, SC, Sandrock, C, Focke, WW (2018) "A simplicial homology algorithm for lipschitz optimization",
@@ -49,18 +77,31 @@ def optimise_policy(expected_returns, u, epsilon=0, global_opt=False, init_strat
          simplicial has much better theoretical convergence guarantees. (Default value = False)
         init_strat (ndarray, optional): An initial guess for the optimal policy. (Default value = None)
         guesses (int, optional): The amount of starting guesses to try. (Default value = 1)
+        continuous (bool, optional): Optimise directly in the continuous strategy space of the bijection attached to
+            the utility function. See :func:`optimise_continuous_policy`. (Default value = False)
 
     Returns:
         Tuple[bool, ndarray, float]: Whether the optimisation was successful, the optimised strategy and utility from
         this strategy.
 
     """
+    if continuous:
+        return optimise_continuous_policy(expected_returns, u, epsilon=epsilon, global_opt=global_opt,
+                                          init_strat=init_strat, guesses=guesses)
+
     num_actions = len(expected_returns)
     bounds = [(0, 1)] * num_actions  # Constrain probabilities to 0 and 1.
     constraints = {'type': 'eq', 'fun': lambda x: np.sum(x) - 1}  # Equality constraint is equal to zero by default.
+    jac = None
+    if hasattr(u, 'gradient'):
+        def jac(x):
+            """The gradient of the minimised objective."""
+            return - objective_gradient(x, expected_returns, u)
 
     if global_opt:
         options = {}
+        if jac is not None:
+            options['jac'] = jac
         if epsilon > 0:
             # Set a tolerance for the global optimizer. Note that we don't set a tolerance for each local minimization.
             # We do this because we want to be in the region of the global best-response and by doing it for each local
@@ -84,7 +125,7 @@ def optimise_policy(expected_returns, u, epsilon=0, global_opt=False, init_strat
             tol = None
             if epsilon > 0:
                 tol = epsilon  # Set a specified tolerance.
-            res = scopt.minimize(lambda x: - objective(x, expected_returns, u), guess, bounds=bounds,
+            res = scopt.minimize(lambda x: - objective(x, expected_returns, u), guess, jac=jac, bounds=bounds,
                                  constraints=constraints, tol=tol)
 
             if best_res is None or res['fun'] < best_res['fun']:  # If this local minimization was better, then use it.
@@ -96,6 +137,163 @@ def optimise_policy(expected_returns, u, epsilon=0, global_opt=False, init_strat
     return success, br_strategy, br_utility
 
 
+def optimise_continuous_policy(expected_returns, u, epsilon=0, global_opt=False, init_strat=None, guesses=1):
+    """Optimise a policy directly in the continuous strategy space of a pure-strategy-equivalent game.
+
+    In games that are built from an identity game and a strategy bijection, a mixed strategy is only an indirect
+    representation of a continuous strategy. When a bijection is attached to the utility function with
+    :func:`strategy_bijections.with_bijection`, we instead optimise over the box of continuous strategies and map the
+    result back to a mixed strategy. Every point maps onto the simplex, so there is no equality constraint to handle
+    and no normalisation in the objective. A one-dimensional strategy space uses bounded scalar minimisation and higher
+    dimensions use L-BFGS-B. The global optimiser is SHGO with only bound constraints.
+
+    Args:
+        expected_returns (ndarray): The expected returns from the player's actions.
+        u (callable): The player's utility function, with a ``bijection`` attribute.
+        epsilon (float, optional): Allow epsilon approximate solutions. (Default value = 0)
+        global_opt (bool, optional): Whether to use a global optimiser or a local one. (Default value = False)
+        init_strat (ndarray, optional): An initial guess for the optimal policy. (Default value = None)
+        guesses (int, optional): The amount of starting guesses to try with L-BFGS-B. (Default value = 1)
+
+    Returns:
+        Tuple[bool, ndarray, float]: Whether the optimisation was successful, the optimised strategy and utility from
+        this strategy.
+
+    Raises:
+        ValueError: When no bijection is attached to the utility function.
+
+    """
+    bijection = getattr(u, 'bijection', None)
+    if bijection is None:
+        raise ValueError('A continuous best response requires a bijection attached to the utility function, see '
+                         'strategy_bijections.with_bijection')
+    bounds = bijection.bounds
+
+    def continuous_objective(point):
+        """The negative utility of a continuous strategy."""
+        return - u(bijection.point_to_coord(point) @ expected_returns)
+
+    tol = None
+    if epsilon > 0:
+        tol = epsilon  # Set a specified tolerance.
+
+    if global_opt:
+        options = {}
+        if epsilon > 0:
+            options['f_tol'] = epsilon
+        best_res = scopt.shgo(continuous_objective, bounds=bounds, sampling_method='sobol', options=options)
+    elif len(bounds) == 1:
+        options = {}
+        if epsilon > 0:
+            options['xatol'] = epsilon
+        best_res = scopt.minimize_scalar(lambda x: continuous_objective(np.array([x])), bounds=bounds[0],
+                                         method='bounded', options=options)
+    else:
+        guesses = max(1, guesses)  # Perform at least one guess.
+        lows, highs = np.array(bounds).T
+        init_guesses = []
+        if init_strat is not None:
+            init_guesses.append(np.clip(bijection.coord_to_point(init_strat), lows, highs))
+            guesses -= 1
+
+        for i in range(guesses):
+            init_guesses.append(np.random.uniform(lows, highs))
+
+        best_res = None
+        for guess in init_guesses:
+            res = scopt.minimize(continuous_objective, guess, method='L-BFGS-B', bounds=bounds, tol=tol)
+            if best_res is None or res['fun'] < best_res['fun']:
+                best_res = res
+
+    success = best_res['success']
+    br_strategy = bijection.point_to_coord(np.atleast_1d(best_res['x']))
+    br_utility = objective(br_strategy, expected_returns, u)  # Calculate the utility to force the same precision.
+    return success, br_strategy, br_utility
+
+
+def utility_gradient(expected_vec, u, step=1e-6):
+    """Approximate the gradient of a utility function with central differences.
+
+    When the utility function provides its exact gradient through a ``gradient`` attribute, this is used instead.
+
+    Args:
+        expected_vec (ndarray): The expected vector to compute the gradient at.
+        u (callable): The utility function.
+        step (float, optional): The relative step size for the finite differences. (Default value = 1e-6)
+
+    Returns:
+        ndarray: The gradient of the utility function with respect to each objective.
+    """
+    if hasattr(u, 'gradient'):
+        return u.gradient(expected_vec)
+
+    gradient = np.zeros(len(expected_vec))
+    for objective_idx, value in enumerate(expected_vec):
+        h = step * max(1., abs(value))
+        forward = np.array(expected_vec, dtype=float)
+        backward = np.array(expected_vec, dtype=float)
+        forward[objective_idx] += h
+        backward[objective_idx] -= h
+        gradient[objective_idx] = (u(forward) - u(backward)) / (2 * h)
+    return gradient
+
+
+def logit_response(expected_returns, u, temperature, init_strat=None, step_size=1., max_iter=100, tol=1e-10):
+    r"""Compute a logit response, i.e. a best response that is perturbed by an entropy regulariser.
+
+    The logit response maximises :math:`u(\pi R) + \tau H(\pi)`, where :math:`H` is the entropy of the strategy. Its
+    solution is the fixed point :math:`\pi = softmax(R \nabla u(\pi R) / \tau)`, which we find with a damped
+    fixed-point iteration. Each step moves towards the closed-form logit response to the linearised utility and halves
+    the step until the regularised objective improves. Contrary to :func:`optimise_policy`, no constrained solver is
+    needed as every iterate is a mixture of strategies and therefore already on the simplex.
+
+    Args:
+        expected_returns (ndarray): The expected returns from the player's actions.
+        u (callable): The player's utility function.
+        temperature (float): The temperature of the entropy regulariser. Lower temperatures approach a best response.
+        init_strat (ndarray, optional): An initial guess for the logit response. (Default value = None)
+        step_size (float, optional): The initial step size of the fixed-point iteration. (Default value = 1)
+        max_iter (int, optional): The maximum number of fixed-point iterations. (Default value = 100)
+        tol (float, optional): The tolerance on the change in strategy to stop early. (Default value = 1e-10)
+
+    Returns:
+        Tuple[ndarray, float]: The logit response and its utility.
+    """
+    num_actions = len(expected_returns)
+    if init_strat is None:
+        strategy = np.full(num_actions, 1 / num_actions)
+    else:
+        strategy = normalise_strat(init_strat)
+
+    def regularised_objective(strat):
+        """The utility of a strategy plus its entropy bonus."""
+        entropy = - np.sum(strat * np.log(np.maximum(strat, np.finfo(float).tiny)))
+        return objective(strat, expected_returns, u) + temperature * entropy
+
+    value = regularised_objective(strategy)
+
+    for _ in range(max_iter):
+        gradient = expected_returns @ utility_gradient(strategy @ expected_returns, u)
+        target = softmax_policy(gradient / temperature)  # The logit response to the linearised utility.
+        step = step_size
+
+        while True:  # Backtrack on the step size to guarantee ascent on the regularised objective.
+            new_strategy = (1 - step) * strategy + step * target
+            new_value = regularised_objective(new_strategy)
+            if new_value >= value or step < tol:
+                break
+            step /= 2
+
+        converged = np.max(np.abs(new_strategy - strategy)) < tol
+        strategy = new_strategy
+        value = new_value
+        if converged:
+            break
+
+    utility = objective(strategy, expected_returns, u)
+    return strategy, utility
+
+
 def calc_expected_returns(player, payoff_matrix, joint_strategy):
     """Calculate the expected return for a player's actions with a given joint strategy.
 
@@ -104,33 +302,142 @@ def calc_expected_returns(player, payoff_matrix, joint_strategy):
         payoff_matrix (ndarray): The payoff matrix for the given player.
         joint_strategy (List[ndarray]): A list of each player's individual strategy.
 
+    Note:
+        Payoff matrices that are not stored as an ndarray, such as :class:`identity_game.ImplicitIdentityPayoff`, can
+        compute expected returns themselves through an ``expected_returns(player, joint_strategy)`` method.
+
     Returns:
         ndarray: The expected returns for the given player's actions.
 
     """
-    num_objectives = payoff_matrix.shape[-1]
-    num_actions = len(joint_strategy[player])
-    num_players = len(joint_strategy)
-    opponents = np.delete(np.arange(num_players), player)
+    if hasattr(payoff_matrix, 'expected_returns'):
+        return payoff_matrix.expected_returns(player, joint_strategy)
+
+    if isinstance(payoff_matrix, np.memmap):  # Never read a memory-mapped payoff matrix in full.
+        return chunked_expected_returns(player, payoff_matrix, joint_strategy)
+
+    if len(joint_strategy) == 2 and isinstance(payoff_matrix, np.ndarray):  # A fast path for two-player games.
+        return two_player_expected_returns(payoff_matrix, joint_strategy[1 - player], player)
+
+    return contract_opponents(player, payoff_matrix, joint_strategy)
+
+
+def compute_dtype(payoff_matrix):
+    """Get the floating point type in which to compute with a payoff matrix.
+
+    Args:
+        payoff_matrix (ndarray): A payoff matrix.
+
+    Returns:
+        dtype: The type of the payoff matrix when it is a floating point type, otherwise float64.
+    """
+    dtype = getattr(payoff_matrix, 'dtype', np.dtype(np.float64))
+    return dtype if np.issubdtype(dtype, np.floating) else np.dtype(np.float64)
+
+
+def precision_tolerance(payoff_matrix, utility, tol=1e-12):
+    """Widen a tolerance on utilities to the precision of a payoff matrix.
+
+    Expected returns from a lower precision payoff matrix are accumulated in that precision, so their rounding errors
+    grow with the magnitude of the utility. For float64 payoff matrices, the tolerance is returned unchanged.
+
+    Args:
+        payoff_matrix (ndarray): A payoff matrix.
+        utility (float): The utility the tolerance applies to.
+        tol (float, optional): The tolerance in float64. (Default value = 1e-12)
+
+    Returns:
+        float: The tolerance.
+    """
+    eps = np.finfo(compute_dtype(payoff_matrix)).eps
+    if eps <= np.finfo(np.float64).eps:
+        return tol
+    return max(tol, 100 * eps * max(1., abs(utility)))
+
+
+@lru_cache(maxsize=None)
+def plan_contraction(shape, player):
+    """Plan the order in which the opponents of a player are contracted out of a payoff matrix.
+
+    Contracting the opponent with the most actions first shrinks the intermediate tensors the fastest. The plan only
+    depends on the shape of the payoff matrix, so it is cached.
+
+    Args:
+        shape (Tuple[int]): The shape of the payoff matrix.
+        player (int): The player to calculate expected returns for.
+
+    Returns:
+        Tuple[Tuple[int, Tuple[int], Tuple[int]]]: For every contraction, the opponent and the axes of the tensor
+        before and after contracting them, in the format of ``np.einsum`` subscripts.
+    """
+    num_players = len(shape) - 1
+    opponents = sorted((opponent for opponent in range(num_players) if opponent != player),
+                       key=lambda opponent: shape[opponent], reverse=True)
+    axes = tuple(range(num_players + 1))  # An axis per player and the objectives, labelled by their original index.
+    plan = []
+    for opponent in opponents:
+        remaining_axes = tuple(axis for axis in axes if axis != opponent)
+        plan.append((opponent, axes, remaining_axes))
+        axes = remaining_axes
+    return tuple(plan)
+
+
+def contract_opponents(player, payoff_matrix, joint_strategy):
+    """Contract the strategies of all opponents out of a payoff matrix, following :func:`plan_contraction`.
+
+    Every step is a single ``np.einsum`` call with two operands, which sums the weighted payoffs while iterating over
+    the tensor. Contrary to multiplying the tensor by a broadcast strategy and summing afterwards, this never
+    materialises a temporary of the size of its input. The only allocations are the intermediate results, which are
+    smaller than the payoff matrix by at least the number of actions of the contracted opponent.
+
+    Args:
+        player (int): The player to caculate expected returns for.
+        payoff_matrix (ndarray): The payoff matrix for the given player.
+        joint_strategy (List[ndarray]): A list of each player's individual strategy.
+
+    Note:
+        The contractions run in the precision of the payoff matrix, so a float32 payoff matrix halves the memory
+        traffic. The expected returns are always returned in float64, as utility functions and optimisers expect.
+
+    Returns:
+        ndarray: The expected returns for the given player's actions.
+    """
+    dtype = compute_dtype(payoff_matrix)
     expected_returns = payoff_matrix
+    for opponent, axes, remaining_axes in plan_contraction(payoff_matrix.shape, player):
+        strategy = joint_strategy[opponent].astype(dtype, copy=False)  # Mixing precisions would copy the tensor.
+        expected_returns = np.einsum(expected_returns, axes, strategy, [opponent], remaining_axes)
+    return expected_returns.astype(np.float64, copy=False)
 
-    for opponent in opponents:  # Loop over all opponent strategies.
-        strategy = joint_strategy[opponent]  # Get this opponent's strategy.
 
-        # We reshape this strategy to be able to multiply along the correct axis for weighting expected returns.
-        # For example if you end up in [1, 2] or [2, 3] with 50% probability.
-        # We calculate the individual expected returns first: [0.5, 1] or [1, 1.5]
-        dim_array = np.ones((1, expected_returns.ndim), int).ravel()
-        dim_array[opponent] = -1
-        strategy_reshaped = strategy.reshape(dim_array)
+def chunked_expected_returns(player, payoff_matrix, joint_strategy, chunk_bytes=2 ** 26):
+    """Calculate the expected returns for a player's actions by reading the payoff matrix in chunks.
 
-        expected_returns = expected_returns * strategy_reshaped  # Calculate the probability of a joint state occurring.
-        # We now take the sum of the weighted returns to get the expected returns.
-        # We need keepdims=True to make sure that the opponent still exists at the correct axis, their action space is
-        # just reduced to one action resulting in the expected return now.
-        expected_returns = np.sum(expected_returns, axis=opponent, keepdims=True)
+    The payoff matrix is read in chunks along the axis of the first opponent. Every chunk is contracted with the
+    strategies of all opponents at once and the partial expected returns are summed. The peak memory use is therefore a
+    small multiple of a single chunk, which allows payoff matrices that are memory-mapped and larger than the memory.
+
+    Args:
+        player (int): The player to caculate expected returns for.
+        payoff_matrix (ndarray): The payoff matrix for the given player, typically a memory-mapped array.
+        joint_strategy (List[ndarray]): A list of each player's individual strategy.
+        chunk_bytes (int, optional): The maximum size of a chunk in bytes. (Default value = 2 ** 26)
 
-    expected_returns = expected_returns.reshape(num_actions, num_objectives)  # Cast the result to a correct shape.
+    Returns:
+        ndarray: The expected returns for the given player's actions.
+    """
+    chunk_axis = 0 if player != 0 else 1  # The first opponent.
+    slice_bytes = payoff_matrix.nbytes // payoff_matrix.shape[chunk_axis]  # The size of one index along the axis.
+    chunk_size = max(1, chunk_bytes // max(1, slice_bytes))
+
+    expected_returns = np.zeros((payoff_matrix.shape[player], payoff_matrix.shape[-1]))
+    for start in range(0, payoff_matrix.shape[chunk_axis], chunk_size):
+        chunk_slice = slice(start, start + chunk_size)
+        index = (slice(None),) * chunk_axis + (chunk_slice,)
+        chunk = np.asarray(payoff_matrix[index])  # Read only this chunk from disk.
+        chunk_joint_strategy = list(joint_strategy)
+        chunk_joint_strategy[chunk_axis] = joint_strategy[chunk_axis][chunk_slice]
+        expected_returns += contract_opponents(player, chunk, chunk_joint_strategy)
 
     return expected_returns
 
@@ -153,7 +460,28 @@ def calc_utility_from_joint_strat(u, player, payoff_matrix, joint_strategy):
     return utility
 
 
-def calc_best_response(u, player, payoff_matrix, joint_strategy, epsilon=0, global_opt=False, init_strat=None):
+def passes_vertex_check(expected_returns, u, utility, tol=1e-12):
+    """Check that no pure strategy, i.e. a vertex of the simplex, beats the utility of a strategy.
+
+    This is a cheap necessary condition for a best response, requiring only one utility evaluation per action.
+
+    Args:
+        expected_returns (ndarray): The expected returns from the player's actions.
+        u (callable): The player's utility function.
+        utility (float): The utility of the candidate best response.
+        tol (float, optional): The tolerance in the utility comparison. (Default value = 1e-12)
+
+    Returns:
+        bool: Whether the utility is at least as high as the utility of every pure strategy.
+    """
+    for expected_vec in expected_returns:  # The expected vector of a pure strategy is a row of the expected returns.
+        if u(expected_vec) > utility + tol:
+            return False
+    return True
+
+
+def calc_best_response(u, player, payoff_matrix, joint_strategy, epsilon=0, global_opt=False, init_strat=None,
+                       vertex_check=False, store=None, fingerprint=None, continuous=False):
     """Calculate a best response for a given player to a joint strategy.
 
     Args:
@@ -165,18 +493,63 @@ def calc_best_response(u, player, payoff_matrix, joint_strategy, epsilon=0, glob
             (Default value = 0)
         global_opt (bool, optional): Whether to use a global optimiser or a local one. (Default value = False)
         init_strat (ndarray, optional): The initial guess for the best response. (Default value = None)
+        vertex_check (bool, optional): When using a local optimiser, fall back to the global optimiser if the local
+            optimisation failed or a pure strategy beats the local best response. (Default value = False)
+        store (BestResponseStore, optional): A persistent store to look up and save best responses.
+            (Default value = None)
+        fingerprint (str, optional): The fingerprint of the game, required when using a store. (Default value = None)
+        continuous (bool, optional): Search the best response directly in the continuous strategy space of the
+            bijection attached to the utility function. (Default value = False)
 
     Returns:
         ndarray: A best response strategy.
 
+    Raises:
+        ValueError: When a store is given without a fingerprint, or when searching a continuous best response for a
+            utility function without a bijection.
+
     """
+    if store is not None:
+        key = store.make_key(fingerprint, player, joint_strategy, epsilon=epsilon, global_opt=global_opt,
+                             init_strat=init_strat, vertex_check=vertex_check, continuous=continuous)
+        cached = store.get(key)
+        if cached is not None:
+            return cached[1]
+
     expected_returns = calc_expected_returns(player, payoff_matrix, joint_strategy)
-    _, br_strategy, _ = optimise_policy(expected_returns, u, epsilon=epsilon, global_opt=global_opt,
-                                        init_strat=init_strat)
+    success, br_strategy, br_utility = optimise_policy(expected_returns, u, epsilon=epsilon, global_opt=global_opt,
+                                                       init_strat=init_strat, continuous=continuous)
+    if vertex_check and not global_opt:
+        if not success or not passes_vertex_check(expected_returns, u, br_utility):
+            success, br_strategy, br_utility = optimise_policy(expected_returns, u, epsilon=epsilon, global_opt=True,
+                                                               continuous=continuous)
+
+    if store is not None:
+        store.put(key, success, br_strategy, br_utility)
     return br_strategy
 
 
-def verify_nash(monfg, u_tpl, joint_strat, epsilon=0, tol=1e-12, strict=False):
+def calc_logit_response(u, player, payoff_matrix, joint_strategy, temperature=0.1, init_strat=None):
+    """Calculate a logit response for a given player to a joint strategy.
+
+    Args:
+        u (callable): The utility function for this player.
+        player (int): The player to calculate expected returns for.
+        payoff_matrix (ndarray): The payoff matrix for the given player.
+        joint_strategy (List[ndarray]): A list of each player's individual strategy.
+        temperature (float, optional): The temperature of the entropy regulariser. (Default value = 0.1)
+        init_strat (ndarray, optional): The initial guess for the logit response. (Default value = None)
+
+    Returns:
+        ndarray: A logit response strategy.
+
+    """
+    expected_returns = calc_expected_returns(player, payoff_matrix, joint_strategy)
+    response, _ = logit_response(expected_returns, u, temperature, init_strat=init_strat)
+    return response
+
+
+def verify_nash(monfg, u_tpl, joint_strat, epsilon=0, tol=1e-12, strict=False, store=None, fingerprint=None):
     """Verify whether the joint strategy is a Nash equilibrium
 
     Args:
@@ -185,9 +558,13 @@ def verify_nash(monfg, u_tpl, joint_strat, epsilon=0, tol=1e-12, strict=False):
         joint_strat (List[ndarray]): The joint strategy to verify.
         epsilon (float, optional): An optional parameter to allow for approximate Nash equilibria. (Default value = 0)
         tol (float, optional): The tolerance in the utility calculation. The default is set to the shgo default from
-        SciPy. (Default value = 1e-12)
+        SciPy. For payoff matrices with a lower precision than float64, it is widened by :func:`precision_tolerance`.
+        (Default value = 1e-12)
         strict (bool, optional): Whether to count unsuccessful optimisations as unverified and thus returning False.
         (Default value = False)
+        store (BestResponseStore, optional): A persistent store to look up and save best responses.
+            (Default value = None)
+        fingerprint (str, optional): The fingerprint of the game, required when using a store. (Default value = None)
 
     Note:
         A Nash equilibrium occurs whenever all strategies are best-responses to each other. We specifically use a global
@@ -197,17 +574,31 @@ def verify_nash(monfg, u_tpl, joint_strat, epsilon=0, tol=1e-12, strict=False):
 
     Returns:
         bool: Whether the given joint strategy is a Nash equilibrium.
+
+    Raises:
+        ValueError: When a store is given without a fingerprint.
     """
     for player, (payoffs, u, strat) in enumerate(zip(monfg, u_tpl, joint_strat)):
         expected_returns = calc_expected_returns(player, payoffs, joint_strat)
         utility_from_strat = objective(strat, expected_returns, u)
-        success, br_strat, br_utility = optimise_policy(expected_returns, u, global_opt=True)
-        if (not strict or success) and utility_from_strat + epsilon + tol < br_utility:
+        cached = None
+        if store is not None:
+            key = store.make_key(fingerprint, player, joint_strat, global_opt=True)
+            cached = store.get(key)
+
+        if cached is None:
+            success, br_strat, br_utility = optimise_policy(expected_returns, u, global_opt=True)
+            if store is not None:
+                store.put(key, success, br_strat, br_utility)
+        else:
+            success, br_strat, br_utility = cached
+        player_tol = precision_tolerance(payoffs, br_utility, tol=tol)
+        if (not strict or success) and utility_from_strat + epsilon + player_tol < br_utility:
             return False
     return True
 
 
-def verify_all_nash(monfg, u_tpl, joint_strats, epsilon=0, tol=1e-12):
+def verify_all_nash(monfg, u_tpl, joint_strats, epsilon=0, tol=1e-12, store=None, fingerprint=None):
     """Globally verify if each joint strategy in a list is a Nash equilibrium.
 
     Args:
@@ -217,11 +608,14 @@ def verify_all_nash(monfg, u_tpl, joint_strats, epsilon=0, tol=1e-12):
         epsilon (float, optional): An optional parameter to allow for approximate Nash equilibria. (Default value = 0)
         tol (float, optional): The tolerance in the utility calculation. The default is set to the shgo default from
         SciPy. (Default value = 1e-12)
+        store (BestResponseStore, optional): A persistent store to look up and save best responses.
+            (Default value = None)
+        fingerprint (str, optional): The fingerprint of the game, required when using a store. (Default value = None)
 
     Returns:
         bool: Whether the joint_strategies in the list are actually Nash equilibria.
     """
     for joint_strat in joint_strats:
-        if not verify_nash(monfg, u_tpl, joint_strat, epsilon=epsilon, tol=tol):
+        if not verify_nash(monfg, u_tpl, joint_strat, epsilon=epsilon, tol=tol, store=store, fingerprint=fingerprint):
             return False
     return True
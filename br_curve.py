@@ -0,0 +1,186 @@
+import os
+
+import numpy as np
+
+from br_store import game_fingerprint
+from experiments import continuous_br
+
+
+def npz_path(path):
+    """Get the path :func:`numpy.savez` writes to, which always ends with ``.npz``.
+
+    Args:
+        path (str): A path with or without the ``.npz`` extension.
+
+    Returns:
+        str: The path with the ``.npz`` extension.
+    """
+    return path if path.endswith('.npz') else f'{path}.npz'
+
+
+class BestResponseCurve:
+    """A precomputed best-response curve for a player in a two-player continuous game.
+
+    The curve is computed with exact best responses on a grid of opponent strategies. The grid is refined adaptively
+    wherever the best response changes by more than a tolerance between two neighbouring points. Intervals which still
+    exceed the tolerance at the maximum refinement depth are considered discontinuities. Lookups interpolate linearly
+    between grid points, except inside discontinuities where the best response is solved exactly instead.
+    """
+
+    def __init__(self, monfg, u_tpl, player, min_x, max_x):
+        """Create an empty best-response curve.
+
+        Args:
+            monfg (List[ndarray]): A list of payoff matrices.
+            u_tpl (Tuple[callable]): A tuple of utility functions.
+            player (int): The player to compute the best-response curve for.
+            min_x (float): The minimum value in the continuous game.
+            max_x (float): The maximum value in the continuous game.
+        """
+        self.monfg = monfg
+        self.u_tpl = u_tpl
+        self.player = player
+        self.min_x = min_x
+        self.max_x = max_x
+        self.fingerprint = game_fingerprint(monfg, u_tpl)
+        self.opp_xs = None
+        self.brs = None
+        self.jumps = None
+
+    def exact_br(self, opp_x):
+        """Compute the exact best response to an opponent strategy.
+
+        Args:
+            opp_x (float): The opponent strategy in the continuous game.
+
+        Returns:
+            float: A best-response in the continuous game.
+        """
+        return continuous_br(self.monfg, self.u_tpl, self.player, opp_x, self.min_x, self.max_x)
+
+    def build(self, num_points=101, tol=None, max_depth=8):
+        """Compute the best-response curve.
+
+        Args:
+            num_points (int, optional): The number of points in the initial uniform grid. (Default value = 101)
+            tol (float, optional): The largest change in best response allowed between neighbouring grid points. By
+                default this is one percent of the strategy interval. (Default value = None)
+            max_depth (int, optional): The maximum number of times an initial grid interval is halved.
+                (Default value = 8)
+
+        Returns:
+            BestResponseCurve: The curve itself.
+        """
+        if tol is None:
+            tol = (self.max_x - self.min_x) / 100
+        min_width = (self.max_x - self.min_x) / (num_points - 1) / 2 ** max_depth
+
+        opp_xs = list(np.linspace(self.min_x, self.max_x, num_points))
+        brs = [self.exact_br(opp_x) for opp_x in opp_xs]
+        jumps = [False] * (num_points - 1)
+        idx = 0
+
+        while idx < len(opp_xs) - 1:  # Refine each interval in place until it is smooth or too narrow.
+            if abs(brs[idx + 1] - brs[idx]) <= tol:
+                idx += 1
+            elif opp_xs[idx + 1] - opp_xs[idx] <= min_width:
+                jumps[idx] = True
+                idx += 1
+            else:
+                mid_x = (opp_xs[idx] + opp_xs[idx + 1]) / 2
+                opp_xs.insert(idx + 1, mid_x)
+                brs.insert(idx + 1, self.exact_br(mid_x))
+                jumps.insert(idx + 1, False)
+
+        self.opp_xs = np.array(opp_xs)
+        self.brs = np.array(brs)
+        self.jumps = np.array(jumps, dtype=bool)
+        return self
+
+    def __call__(self, opp_x):
+        """Look up the best responses to one or more opponent strategies.
+
+        Args:
+            opp_x (float | ndarray): The opponent strategies in the continuous game.
+
+        Returns:
+            float | ndarray: The best responses in the continuous game.
+        """
+        opp_x = np.asarray(opp_x, dtype=float)
+        brs = np.interp(opp_x, self.opp_xs, self.brs)
+
+        interval = np.clip(np.searchsorted(self.opp_xs, opp_x, side='right') - 1, 0, len(self.jumps) - 1)
+        exact = self.jumps[interval] & ~np.isin(opp_x, self.opp_xs)  # Grid points are already exact.
+
+        if brs.ndim == 0:
+            return self.exact_br(float(opp_x)) if exact else float(brs)
+
+        for idx in np.flatnonzero(exact):
+            brs[idx] = self.exact_br(opp_x[idx])
+        return brs
+
+    def save(self, path):
+        """Save the computed curve to disk.
+
+        Args:
+            path (str): The file to save the curve to, as an ``.npz`` archive. The extension is added when missing.
+        """
+        np.savez(npz_path(path), opp_xs=self.opp_xs, brs=self.brs, jumps=self.jumps, player=self.player,
+                 min_x=self.min_x, max_x=self.max_x, fingerprint=self.fingerprint)
+
+    def load(self, path):
+        """Load a previously computed curve from disk.
+
+        Args:
+            path (str): The file to load the curve from. The ``.npz`` extension is added when missing.
+
+        Returns:
+            BestResponseCurve: The curve itself.
+
+        Raises:
+            ValueError: When the saved curve belongs to a different game, player or strategy interval.
+        """
+        path = npz_path(path)
+        with np.load(path) as data:
+            if (data['player'], data['min_x'], data['max_x']) != (self.player, self.min_x, self.max_x):
+                raise ValueError(f'The curve in {path} was computed for a different player or strategy interval')
+            if 'fingerprint' not in data or str(data['fingerprint']) != self.fingerprint:
+                raise ValueError(f'The curve in {path} was computed for a different game')
+            self.opp_xs = data['opp_xs']
+            self.brs = data['brs']
+            self.jumps = data['jumps']
+        return self
+
+
+def load_or_build_br_curve(path, monfg, u_tpl, player, min_x, max_x, num_points=101, tol=None, max_depth=8):
+    """Load a best-response curve from disk or build and save it when it does not exist yet.
+
+    The file stores the fingerprint of the game from :func:`br_store.game_fingerprint`. A saved curve of a different
+    game, player or strategy interval is considered stale and is rebuilt and overwritten.
+
+    Args:
+        path (str): The file to load the curve from or save it to.
+        monfg (List[ndarray]): A list of payoff matrices.
+        u_tpl (Tuple[callable]): A tuple of utility functions.
+        player (int): The player to compute the best-response curve for.
+        min_x (float): The minimum value in the continuous game.
+        max_x (float): The maximum value in the continuous game.
+        num_points (int, optional): The number of points in the initial uniform grid. (Default value = 101)
+        tol (float, optional): The largest change in best response allowed between neighbouring grid points.
+            (Default value = None)
+        max_depth (int, optional): The maximum number of times an initial grid interval is halved.
+            (Default value = 8)
+
+    Returns:
+        BestResponseCurve: The best-response curve.
+    """
+    curve = BestResponseCurve(monfg, u_tpl, player, min_x, max_x)
+    if os.path.exists(npz_path(path)):
+        try:
+            return curve.load(path)
+        except ValueError:
+            pass  # The curve belongs to another game, so build it again.
+
+    curve.build(num_points=num_points, tol=tol, max_depth=max_depth)
+    curve.save(path)
+    return curve
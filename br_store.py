@@ -0,0 +1,234 @@
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+
+import numpy as np
+
+
+def _hash_value(fingerprint, value):
+    """Add a value that a utility function depends on to a fingerprint.
+
+    Args:
+        fingerprint (hash): The fingerprint to update.
+        value (object): The value.
+    """
+    if isinstance(value, (bool, int, float, complex, str, bytes, np.number)):
+        fingerprint.update(repr(value).encode())
+    elif isinstance(value, np.ndarray):
+        fingerprint.update(str((value.shape, value.dtype.str)).encode())
+        fingerprint.update(np.ascontiguousarray(value).tobytes())
+    elif isinstance(value, (tuple, list)):
+        for item in value:
+            _hash_value(fingerprint, item)
+    elif callable(value):
+        _hash_utility(fingerprint, value)
+    else:  # Other objects, such as bijections, are only identified by their type.
+        fingerprint.update(type(value).__name__.encode())
+
+
+def _hash_utility(fingerprint, u):
+    """Add a utility function to a fingerprint.
+
+    A function is identified by its name, its bytecode and the values it closes over or has as defaults. This tells
+    apart the utility functions of games that are set up with different parameters, such as the Bertrand pricing game.
+
+    Args:
+        fingerprint (hash): The fingerprint to update.
+        u (callable): The utility function.
+    """
+    u = getattr(u, 'py_func', u)  # The Python function behind a Numba dispatcher.
+    fingerprint.update(f'{getattr(u, "__module__", "")}.{getattr(u, "__qualname__", type(u).__name__)}'.encode())
+    code = getattr(u, '__code__', None)
+    if code is not None:
+        fingerprint.update(code.co_code)
+        fingerprint.update(repr(code.co_consts).encode())
+    for cell in getattr(u, '__closure__', None) or ():
+        _hash_value(fingerprint, cell.cell_contents)
+    _hash_value(fingerprint, getattr(u, '__defaults__', None) or ())
+
+
+def game_fingerprint(monfg, u_tpl=None, **params):
+    """Compute a fingerprint that identifies a game.
+
+    Note:
+        Utility functions are identified by their code and the plain values they close over. Any parameters that
+        define them in another way, for instance through a global variable or an object, must be passed as well.
+
+    Args:
+        monfg (List[ndarray]): A list of payoff matrices.
+        u_tpl (Tuple[callable], optional): A tuple of utility functions. (Default value = None)
+        **params: Further parameters that define the game and its utility functions.
+
+    Returns:
+        str: A hexadecimal fingerprint of the game.
+    """
+    fingerprint = hashlib.sha256()
+    for payoff_matrix in monfg:
+        fingerprint.update(str(payoff_matrix.shape).encode())
+        if isinstance(payoff_matrix, np.ndarray):
+            fingerprint.update(np.ascontiguousarray(payoff_matrix).tobytes())
+        else:  # Implicit payoff matrices are defined by their type and shape.
+            fingerprint.update(type(payoff_matrix).__name__.encode())
+    for u in u_tpl or ():
+        _hash_utility(fingerprint, u)
+    fingerprint.update(repr(sorted(params.items())).encode())
+    return fingerprint.hexdigest()
+
+
+class BestResponseStore:
+    """A persistent store of best responses that can be shared between processes and runs.
+
+    Best responses are saved in a SQLite database file. SQLite takes care of locking, so any number of threads and
+    processes can read from and write to the same file. Once the store holds more than the maximum number of entries,
+    the least recently used entries are evicted.
+    """
+
+    def __init__(self, path, max_entries=1000000, decimals=8, timeout=60):
+        """Open a store and create the database file when it does not exist yet.
+
+        Args:
+            path (str): The path to the database file.
+            max_entries (int, optional): The maximum number of best responses to keep. (Default value = 1000000)
+            decimals (int, optional): The number of decimals strategies are rounded to in keys. (Default value = 8)
+            timeout (float, optional): The number of seconds to wait for a lock held by another process.
+                (Default value = 60)
+        """
+        self.path = path
+        self.max_entries = max_entries
+        self.decimals = decimals
+        self.timeout = timeout
+        self.evict_every = max(1, max_entries // 100)  # Amortise the cost of counting entries.
+        self._num_puts = 0
+        self._lock = threading.Lock()
+        self._connection = None
+        self._pid = None
+
+        with self._lock:
+            connection = self._connect()
+            connection.execute('PRAGMA journal_mode=WAL')
+            connection.execute('CREATE TABLE IF NOT EXISTS best_responses '
+                               '(key TEXT PRIMARY KEY, success INTEGER, strategy BLOB, utility REAL, last_access REAL)')
+            connection.execute('CREATE INDEX IF NOT EXISTS last_access_idx ON best_responses (last_access)')
+            connection.commit()
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state['_lock'] = None
+        state['_connection'] = None
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+
+    def _connect(self):
+        """Get the connection for this process, opening a new one after a fork or unpickling.
+
+        Returns:
+            Connection: A connection to the database.
+        """
+        if self._connection is None or self._pid != os.getpid():
+            self._connection = sqlite3.connect(self.path, timeout=self.timeout, check_same_thread=False)
+            self._pid = os.getpid()
+        return self._connection
+
+    def make_key(self, fingerprint, player, joint_strategy, epsilon=0, global_opt=False, init_strat=None,
+                 vertex_check=False, continuous=False):
+        """Make the key for a best response.
+
+        The player's own strategy is left out, as a best response only depends on the opponents. The initial guess is
+        only part of the key for local optimisation, as it does not influence the global optimiser.
+
+        Args:
+            fingerprint (str): The fingerprint of the game.
+            player (int): The player that best responds.
+            joint_strategy (List[ndarray]): A list of each player's individual strategy.
+            epsilon (float, optional): The tolerance parameter of the best response. (Default value = 0)
+            global_opt (bool, optional): Whether a global optimiser is used. (Default value = False)
+            init_strat (ndarray, optional): The initial guess for the best response. (Default value = None)
+            vertex_check (bool, optional): Whether a local best response falls back to the global optimiser.
+                (Default value = False)
+            continuous (bool, optional): Whether the best response is searched in the continuous strategy space.
+                (Default value = False)
+
+        Returns:
+            str: The key.
+
+        Raises:
+            ValueError: When no fingerprint is given, as keys of different games would then collide.
+        """
+        if fingerprint is None:
+            raise ValueError('A game fingerprint is required to use a best response store, see game_fingerprint')
+        key = hashlib.sha256(f'{fingerprint}|{player}'.encode())
+        for opponent, strategy in enumerate(joint_strategy):
+            if opponent != player:
+                key.update(self._quantise(strategy))
+
+        if global_opt:
+            key.update(f'|global|{epsilon}'.encode())
+        else:
+            key.update(f'|local|{epsilon}|{vertex_check}|'.encode())
+            if init_strat is not None:
+                key.update(self._quantise(init_strat))
+        if continuous:
+            key.update(b'|continuous')
+        return key.hexdigest()
+
+    def _quantise(self, strategy):
+        """Round a strategy to the number of decimals of the store.
+
+        Args:
+            strategy (ndarray): A strategy.
+
+        Returns:
+            bytes: The rounded strategy as bytes.
+        """
+        return (np.round(np.asarray(strategy, dtype=float), self.decimals) + 0.).tobytes()  # Adding 0 removes -0.
+
+    def get(self, key):
+        """Get a best response from the store.
+
+        Args:
+            key (str): The key of the best response.
+
+        Returns:
+            Tuple[bool, ndarray, float] | None: Whether the optimisation was successful, the best response and its
+            utility or None when the key is not in the store.
+        """
+        with self._lock:
+            connection = self._connect()
+            row = connection.execute('SELECT success, strategy, utility FROM best_responses WHERE key = ?',
+                                     (key,)).fetchone()
+            if row is None:
+                return None
+            connection.execute('UPDATE best_responses SET last_access = ? WHERE key = ?', (time.time(), key))
+            connection.commit()
+
+        success, strategy, utility = row
+        return bool(success), np.frombuffer(strategy, dtype=float).copy(), utility
+
+    def put(self, key, success, strategy, utility):
+        """Save a best response in the store.
+
+        Args:
+            key (str): The key of the best response.
+            success (bool): Whether the optimisation was successful.
+            strategy (ndarray): The best response strategy.
+            utility (float): The utility of the best response.
+        """
+        strategy = np.ascontiguousarray(strategy, dtype=float).tobytes()
+        with self._lock:
+            connection = self._connect()
+            connection.execute('INSERT OR REPLACE INTO best_responses VALUES (?, ?, ?, ?, ?)',
+                               (key, int(success), strategy, float(utility), time.time()))
+            self._num_puts += 1
+            if self._num_puts % self.evict_every == 0:
+                connection.execute('DELETE FROM best_responses WHERE key IN (SELECT key FROM best_responses '
+                                   'ORDER BY last_access DESC LIMIT -1 OFFSET ?)', (self.max_entries,))
+            connection.commit()
+
+    def __len__(self):
+        with self._lock:
+            return self._connect().execute('SELECT COUNT(*) FROM best_responses').fetchone()[0]
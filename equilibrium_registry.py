@@ -0,0 +1,143 @@
+import numpy as np
+from scipy.spatial import cKDTree
+
+from best_response import verify_nash
+
+
+class EquilibriumRegistry:
+    """A registry that clusters joint strategies from many runs and verifies every cluster only once.
+
+    Joint strategies are flattened and a strategy joins the nearest cluster whose representative is within the
+    tolerance in every action probability, or else becomes the representative of a new cluster. Representatives are
+    kept in a KD-tree, so looking up a strategy is logarithmic in the number of clusters. The tree is rebuilt once
+    enough new representatives have been collected, which are checked directly in the meantime.
+    """
+
+    def __init__(self, player_actions, tol=1e-3, rebuild_every=32):
+        """Create an empty registry.
+
+        Args:
+            player_actions (Tuple[int]): A tuple of actions indexed by player.
+            tol (float, optional): The largest difference in action probabilities within a cluster.
+                (Default value = 1e-3)
+            rebuild_every (int, optional): The number of new representatives after which the KD-tree is rebuilt.
+                (Default value = 32)
+        """
+        self.player_actions = tuple(player_actions)
+        self.tol = tol
+        self.rebuild_every = rebuild_every
+        self.representatives = np.empty((0, int(np.sum(player_actions))))
+        self.counts = np.empty(0, dtype=int)
+        self.nash = []  # Whether each representative is a Nash equilibrium, or None when not verified yet.
+        self._tree = None
+        self._num_indexed = 0  # The representatives before this index are in the KD-tree.
+
+    def __len__(self):
+        return len(self.representatives)
+
+    def _rebuild(self):
+        """Index all representatives in the KD-tree."""
+        self._tree = cKDTree(self.representatives)
+        self._num_indexed = len(self.representatives)
+
+    def _lookup(self, flat_strategy):
+        """Find the cluster of a flattened joint strategy.
+
+        Args:
+            flat_strategy (ndarray): The flattened joint strategy.
+
+        Returns:
+            int | None: The label of the nearest cluster within the tolerance, or None when there is none.
+        """
+        best_label, best_distance = None, np.inf
+        if self._tree is not None:
+            distance, label = self._tree.query(flat_strategy, p=np.inf, distance_upper_bound=self.tol)
+            if distance <= self.tol:
+                best_label, best_distance = int(label), distance
+
+        pending = self.representatives[self._num_indexed:]
+        if len(pending):
+            distances = np.max(np.abs(pending - flat_strategy), axis=1)
+            nearest = np.argmin(distances)
+            if distances[nearest] <= self.tol and distances[nearest] < best_distance:
+                best_label = self._num_indexed + int(nearest)
+        return best_label
+
+    def add(self, joint_strategy, hits=1):
+        """Register a joint strategy.
+
+        Args:
+            joint_strategy (List[ndarray] | ndarray): A joint strategy, or a flattened joint strategy.
+            hits (int, optional): The number of runs that ended in the joint strategy. (Default value = 1)
+
+        Returns:
+            int: The label of the cluster of the joint strategy.
+        """
+        flat_strategy = np.concatenate(joint_strategy) if isinstance(joint_strategy, list) else joint_strategy
+        label = self._lookup(flat_strategy)
+
+        if label is None:
+            label = len(self.representatives)
+            self.representatives = np.vstack((self.representatives, flat_strategy))
+            self.counts = np.append(self.counts, 0)
+            self.nash.append(None)
+            if len(self.representatives) - self._num_indexed >= self.rebuild_every:
+                self._rebuild()
+
+        self.counts[label] += hits
+        return label
+
+    def add_many(self, flat_strategies):
+        """Register a batch of flattened joint strategies.
+
+        Args:
+            flat_strategies (ndarray): The flattened joint strategies, one on every row.
+
+        Returns:
+            ndarray: The label of the cluster of every joint strategy.
+        """
+        return np.array([self.add(flat_strategy) for flat_strategy in flat_strategies], dtype=int)
+
+    def joint_strategy(self, label):
+        """Get the representative of a cluster as a joint strategy.
+
+        Args:
+            label (int): The label of the cluster.
+
+        Returns:
+            List[ndarray]: The representative joint strategy.
+        """
+        return np.split(self.representatives[label], np.cumsum(self.player_actions)[:-1])
+
+    def verify(self, monfg, u_tpl, epsilon=0, store=None, fingerprint=None):
+        """Verify whether the representative of every cluster is a Nash equilibrium.
+
+        Representatives that were verified before are not verified again.
+
+        Args:
+            monfg (List[ndarray]): An MONFG as a list of payoff matrices.
+            u_tpl (Tuple[callable]): A tuple of utility functions.
+            epsilon (float, optional): The tolerance to accept approximate Nash equilibria. (Default value = 0)
+            store (BestResponseStore, optional): A persistent store to look up and save best responses.
+                (Default value = None)
+            fingerprint (str, optional): The fingerprint of the game, required when using a store.
+                (Default value = None)
+
+        Returns:
+            List[bool]: Whether the representative of each cluster is a Nash equilibrium.
+        """
+        for label, is_nash in enumerate(self.nash):
+            if is_nash is None:
+                self.nash[label] = verify_nash(monfg, u_tpl, self.joint_strategy(label), epsilon=epsilon,
+                                               store=store, fingerprint=fingerprint)
+        return list(self.nash)
+
+    def equilibria(self):
+        """Get the verified Nash equilibria with the number of runs that ended in each of them.
+
+        Returns:
+            List[Tuple[List[ndarray], int]]: Each verified equilibrium and its number of hits, the most frequent first.
+        """
+        labels = [label for label, is_nash in enumerate(self.nash) if is_nash]
+        labels.sort(key=lambda label: -self.counts[label])
+        return [(self.joint_strategy(label), int(self.counts[label])) for label in labels]
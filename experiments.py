@@ -6,14 +6,18 @@ import pandas as pd
 from IBR import iterated_best_response
 from bertrand_pricing_game import setup_bertrand_pricing_game
 from best_response import calc_best_response
+from br_store import BestResponseStore, game_fingerprint
+from equilibrium_registry import EquilibriumRegistry
 from fictitious_play import fictitious_play
+from optimiser_schedule import OptimiserSchedule
 from polynomial_game import setup_polynomial_game
 from strategy_bijections import one_simplex_coord_to_point, one_simplex_point_to_coord
 
-Record = namedtuple('Log', ['run', 'iteration', 'player1', 'player2'])
+Record = namedtuple('Log', ['run', 'iteration', 'player1', 'player2', 'player1_sampling_std', 'player2_sampling_std'],
+                    defaults=(None, None))
 
 
-def continuous_br(monfg, u_tpl, player, opp_x, min_x, max_x):
+def continuous_br(monfg, u_tpl, player, opp_x, min_x, max_x, store=None, fingerprint=None):
     """Compute the best-response to a specific continuous strategy.
 
     Args:
@@ -23,6 +27,9 @@ def continuous_br(monfg, u_tpl, player, opp_x, min_x, max_x):
         opp_x (float): The opponent strategy in the continuous game.
         min_x (float): The minimum value in the continuous game.
         max_x (float): The maximum value in the continuous game.
+        store (BestResponseStore, optional): A persistent store to look up and save best responses.
+            (Default value = None)
+        fingerprint (str, optional): The fingerprint of the game, required when using a store. (Default value = None)
 
     Returns:
         float: A best-response in the continuous game.
@@ -33,29 +40,39 @@ def continuous_br(monfg, u_tpl, player, opp_x, min_x, max_x):
         joint_strat = [player_strat, opp_strat]
     else:
         joint_strat = [opp_strat, player_strat]
-    br_strat = calc_best_response(u_tpl[player], player, monfg[player], joint_strat, global_opt=True)
+    br_strat = calc_best_response(u_tpl[player], player, monfg[player], joint_strat, global_opt=True, store=store,
+                                  fingerprint=fingerprint)
     br_x = one_simplex_coord_to_point(br_strat, min_x, max_x)
     return br_x
 
 
-def run_polynomial_game(min_x=-1, max_x=1, max_iter=1000):
+def run_polynomial_game(min_x=-1, max_x=1, max_iter=1000, play='sampled', schedule=None, verify=True, store=None):
     """Run a polynomial game experiment.
 
     Args:
         min_x (float, optional): The minimum value in the strategy interval. (Default value = -1)
         max_x (float, optional): The maximum value in the strategy interval. (Default value = 1)
         max_iter (int, optional): The maximum number of iterations to run the algorithm for. (Default value = 1000)
+        play (str, optional): How fictitious play players observe each other, either 'sampled' or 'expected'.
+            (Default value = 'sampled')
+        schedule (OptimiserSchedule, optional): A schedule that decides per iteration whether to use a global
+            optimiser. (Default value = None)
+        verify (bool, optional): Verify whether the final strategy is a Nash equilibrium. (Default value = True)
+        store (BestResponseStore, optional): A persistent store to share best responses between runs.
+            (Default value = None)
 
     Returns:
         bool, List[ndarray], List[ndarray]: Whether the final strategy is a Nash equilibrium, the last joint strategy
             and the full log of joint strategies.
     """
     monfg, u_tpl = setup_polynomial_game(min_x, max_x)
-    ne, joint_strat, log = run_experiment(monfg, u_tpl, max_iter=max_iter)
+    ne, joint_strat, log = run_experiment(monfg, u_tpl, max_iter=max_iter, play=play, schedule=schedule,
+                                          verify=verify, store=store)
     return ne, joint_strat, log
 
 
-def run_bertrand_pricing_game(min_price=1, max_price=100, sigma=3, gamma=2, n=2700, m=1, a=50, max_iter=100):
+def run_bertrand_pricing_game(min_price=1, max_price=100, sigma=3, gamma=2, n=2700, m=1, a=50, max_iter=100,
+                              play='sampled', schedule=None, verify=True, store=None):
     """Run a polynomial game experiment.
 
     Args:
@@ -67,17 +84,26 @@ def run_bertrand_pricing_game(min_price=1, max_price=100, sigma=3, gamma=2, n=27
         m (float, optional): The unit cost of production for each firm. (Default value = 1)
         a (float, optional): All factors affecting price other than demand. (Default value = 50)
         max_iter (int, optional): The maximum number of iterations to run the algorithm for. (Default value = 100)
+        play (str, optional): How fictitious play players observe each other, either 'sampled' or 'expected'.
+            (Default value = 'sampled')
+        schedule (OptimiserSchedule, optional): A schedule that decides per iteration whether to use a global
+            optimiser. (Default value = None)
+        verify (bool, optional): Verify whether the final strategy is a Nash equilibrium. (Default value = True)
+        store (BestResponseStore, optional): A persistent store to share best responses between runs.
+            (Default value = None)
 
     Returns:
         bool, List[ndarray], List[ndarray]: Whether the final strategy is a Nash equilibrium, the last joint strategy
             and the full log of joint strategies.
     """
     monfg, u_tpl = setup_bertrand_pricing_game(min_price, max_price, sigma, gamma, n, m, a)
-    ne, joint_strat, log = run_experiment(monfg, u_tpl, max_iter=max_iter)
+    ne, joint_strat, log = run_experiment(monfg, u_tpl, max_iter=max_iter, play=play, schedule=schedule,
+                                          verify=verify, store=store)
     return ne, joint_strat, log
 
 
-def run_experiment(monfg, u_tpl, algorithm='FP', max_iter=1000, variant='simultaneous', global_opt=True):
+def run_experiment(monfg, u_tpl, algorithm='FP', max_iter=1000, variant='simultaneous', global_opt=True,
+                   play='sampled', schedule=None, verify=True, store=None):
     """Run an experiment.
 
     Args:
@@ -88,15 +114,24 @@ def run_experiment(monfg, u_tpl, algorithm='FP', max_iter=1000, variant='simulta
         variant (str, optional): The variant to use, which is either simultaneous or alternating.
             (Default value = 'alternating')
         global_opt (bool, optional): Whether to use a global optimiser or a local one. (Default value = False)
+        play (str, optional): How fictitious play players observe each other, either 'sampled' or 'expected'.
+            (Default value = 'sampled')
+        schedule (OptimiserSchedule, optional): A schedule that decides per iteration whether to use a global
+            optimiser. When given, this overrides ``global_opt``. (Default value = None)
+        verify (bool, optional): Verify whether the final strategy is a Nash equilibrium. (Default value = True)
+        store (BestResponseStore, optional): A persistent store to share best responses between runs.
+            (Default value = None)
 
     Returns:
         bool, List[ndarray], List[ndarray]: Whether the final strategy is a Nash equilibrium, the last joint strategy
             and the full log of joint strategies.
     """
     if algorithm == 'FP':
-        return fictitious_play(monfg, u_tpl, max_iter=max_iter, variant=variant, global_opt=global_opt)
+        return fictitious_play(monfg, u_tpl, max_iter=max_iter, variant=variant, global_opt=global_opt, play=play,
+                               schedule=schedule, verify=verify, store=store)
     elif algorithm == 'IBR':
-        return iterated_best_response(monfg, u_tpl, max_iter=max_iter, variant=variant, global_opt=global_opt)
+        return iterated_best_response(monfg, u_tpl, max_iter=max_iter, variant=variant, global_opt=global_opt,
+                                      schedule=schedule, verify=verify, store=store)
     else:
         raise NotImplementedError('Algorithm {}')
 
@@ -104,6 +139,10 @@ def run_experiment(monfg, u_tpl, algorithm='FP', max_iter=1000, variant='simulta
 def transform_log(run, log, min_x, max_x):
     """Transform the strategy log of a run to continuous strategies.
 
+    Logs of fictitious play with expected play also hold the standard deviation that sampled play would have had on
+    every empirical action probability. The standard deviation of the first action of each player is mapped to the
+    strategy interval as well, which is the spread of the player's empirical strategy under sampled play.
+
     Args:
         run (int): The current run.
         log (List[ndarray]): A log of strategies in the multi-objective game.
@@ -120,7 +159,12 @@ def transform_log(run, log, min_x, max_x):
         strat2 = record[3:5]
         point1 = one_simplex_coord_to_point(strat1, min_x, max_x)
         point2 = one_simplex_coord_to_point(strat2, min_x, max_x)
-        transformed_record = Record(run, i, point1, point2)
+        if len(record) > 6:  # The record of expected play ends with the sampling standard deviations.
+            std1 = record[6] * (max_x - min_x)
+            std2 = record[8] * (max_x - min_x)
+            transformed_record = Record(run, i, point1, point2, std1, std2)
+        else:
+            transformed_record = Record(run, i, point1, point2)
         transformed_log.append(transformed_record)
     return transformed_log
 
@@ -137,12 +181,32 @@ def save_logs(logs, name):
     df.to_csv(filename, index=False)
 
 
-def run_experiments(runs=100):
+def run_experiments(runs=100, play='sampled', scheduled=False, store_path=None):
     """Run all experiments for a number of runs.
 
+    Note:
+        All runs start from the same uniform joint strategy. With expected play, fictitious play is deterministic, so a
+        single run replaces the average over many sampled runs and ``runs`` is ignored.
+
+    The final joint strategies are collected in an equilibrium registry per game, so every distinct outcome is verified
+    to be a Nash equilibrium once instead of after every run.
+
     Args:
         runs (int, optional): The number of times to repeat the experiments. (Default value = 100)
+        play (str, optional): How fictitious play players observe each other, either 'sampled' or 'expected'.
+            (Default value = 'sampled')
+        scheduled (bool, optional): Whether to use an optimiser schedule instead of a global optimiser for every best
+            response. (Default value = False)
+        store_path (str, optional): The path of a best response store that all runs share and that is kept for later
+            experiments. (Default value = None)
+
+    Returns:
+        EquilibriumRegistry, EquilibriumRegistry: The final joint strategies of the polynomial and Bertrand pricing
+        game.
     """
+    if play == 'expected':
+        runs = 1  # Every run would give the same result.
+
     poly_min_x = -1
     poly_max_x = 1
     poly_iters = 200
@@ -158,21 +222,41 @@ def run_experiments(runs=100):
 
     poly_logs = []
     bertrand_logs = []
+    poly_registry = EquilibriumRegistry((2, 2))
+    bertrand_registry = EquilibriumRegistry((2, 2))
+    store = None if store_path is None else BestResponseStore(store_path)
 
     for run in range(runs):
         print(f"[{run + 1}/{runs}] Executing run")
 
-        ne, final_strat, poly_log = run_polynomial_game(min_x=poly_min_x, max_x=poly_max_x, max_iter=poly_iters)
+        ne, final_strat, poly_log = run_polynomial_game(min_x=poly_min_x, max_x=poly_max_x, max_iter=poly_iters,
+                                                        play=play, schedule=OptimiserSchedule() if scheduled else None,
+                                                        verify=False, store=store)
+        poly_registry.add(final_strat)
         poly_logs.extend(transform_log(run, poly_log, poly_min_x, poly_max_x))
 
         ne, final_strat, bertrand_log = run_bertrand_pricing_game(min_price=bertrand_min_x, max_price=bertrand_max_x,
                                                                   sigma=sigma, gamma=gamma, n=n, m=m, a=a,
-                                                                  max_iter=price_iters)
+                                                                  max_iter=price_iters, play=play,
+                                                                  schedule=OptimiserSchedule() if scheduled else None,
+                                                                  verify=False, store=store)
+        bertrand_registry.add(final_strat)
         bertrand_logs.extend(transform_log(run, bertrand_log, bertrand_min_x, bertrand_max_x))
 
     save_logs(poly_logs, "polynomial_game")
     save_logs(bertrand_logs, "bertrand_price_game_full")
 
+    for registry, (monfg, u_tpl) in ((poly_registry, setup_polynomial_game(poly_min_x, poly_max_x)),
+                                     (bertrand_registry, setup_bertrand_pricing_game(bertrand_min_x, bertrand_max_x,
+                                                                                     sigma, gamma, n, m, a))):
+        fingerprint = None if store is None else game_fingerprint(monfg, u_tpl)
+        registry.verify(monfg, u_tpl, store=store, fingerprint=fingerprint)
+    for name, registry in (("Polynomial game", poly_registry), ("Bertrand pricing game", bertrand_registry)):
+        num_equilibrium_runs = sum(hits for _, hits in registry.equilibria())
+        print(f"{name}: {len(registry)} distinct outcomes, {num_equilibrium_runs}/{runs} runs reached an equilibrium")
+
+    return poly_registry, bertrand_registry
+
 
 if __name__ == '__main__':
     run_experiments(runs=1000)
@@ -1,16 +1,27 @@
+from contextlib import nullcontext
+from functools import partial
+
 import numpy as np
 
-from Player import FPPlayer
-from best_response import verify_nash
+from Player import FPPlayer, SmoothFPPlayer
+from best_response import calc_best_response, calc_utility_from_joint_strat, verify_nash
+from br_store import game_fingerprint
+from parallel import BestResponseExecutor
 
 
-def simultaneous_variant(players, epsilon=0, global_opt=False):
+def simultaneous_variant(players, epsilon=0, global_opt=False, vertex_check=False, executor=None, continuous=False):
     """Execute one iteration of the simultaneous fictitious play variant.
 
     Args:
         players (List[FPPlayer]): A list of fictitious play players.
         epsilon (float, optional): The tolerance in best response optimisation.
         global_opt (bool, optional): Whether to find a globally optimal best response or only a locally optimal.
+        vertex_check (bool, optional): Whether to fall back to a global optimiser when a local best response is
+            beaten by a pure strategy. (Default value = False)
+        executor (BestResponseExecutor, optional): An executor to compute all best responses concurrently. When not
+            provided, the best responses are computed one after another. (Default value = None)
+        continuous (bool, optional): Search best responses directly in the continuous strategy spaces of the
+            bijections attached to the utility functions. (Default value = False)
 
     Returns:
         Tuple[bool, List[ndarray]]: Whether the policies have converged and the new joint strategy.
@@ -20,13 +31,25 @@ def simultaneous_variant(players, epsilon=0, global_opt=False):
     joint_strategy = []
 
     for action_player in players:  # Collect actions.
-        actions.append(action_player.select_action())
+        actions.append(action_player.play())
 
     for update_player in players:  # Update the empirical state distributions.
         for action_player_id, action in enumerate(actions):
-            update_player.update_empirical_strategy(action_player_id, action)
+            update_player.observe(action_player_id, action)
 
-        done, br = update_player.update_strategy(epsilon=epsilon, global_opt=global_opt)
+    if executor is None:
+        results = [player.update_strategy(epsilon=epsilon, global_opt=global_opt, vertex_check=vertex_check,
+                                          continuous=continuous) for player in players]
+    else:
+        # Every best response only depends on the empirical strategies, so they can all be computed at once.
+        joint_strategies = [player.calc_joint_strategy() for player in players]
+        init_strats = [player.strategy for player in players]
+        brs = executor.best_responses(joint_strategies, init_strats, epsilon=epsilon, global_opt=global_opt,
+                                      vertex_check=vertex_check, continuous=continuous)
+        results = [player.apply_best_response(br, player_joint_strategy, epsilon=epsilon)
+                   for player, br, player_joint_strategy in zip(players, brs, joint_strategies)]
+
+    for done, br in results:
         joint_strategy.append(br)  # Update the joint strategy.
 
         if not done:
@@ -35,13 +58,17 @@ def simultaneous_variant(players, epsilon=0, global_opt=False):
     return converged, joint_strategy
 
 
-def alternating_variant(players, epsilon=0, global_opt=False):
+def alternating_variant(players, epsilon=0, global_opt=False, vertex_check=False, continuous=False):
     """Execute one iteration of the alternating fictitious play variant.
 
     Args:
         players (List[FPPlayer]): A list of fictitious play players.
         epsilon (float, optional): The tolerance in best response optimisation.
         global_opt (bool, optional): Whether to find a globally optimal best response or only a locally optimal.
+        vertex_check (bool, optional): Whether to fall back to a global optimiser when a local best response is
+            beaten by a pure strategy. (Default value = False)
+        continuous (bool, optional): Search best responses directly in the continuous strategy spaces of the
+            bijections attached to the utility functions. (Default value = False)
 
     Returns:
         Tuple[bool, List[ndarray]]: Whether the policies have converged and the new joint strategy.
@@ -51,13 +78,15 @@ def alternating_variant(players, epsilon=0, global_opt=False):
     joint_strategy = []
 
     for action_id, action_player in enumerate(players):  # Loop once over each player to update with alternating.
-        done, br = action_player.update_strategy(epsilon=epsilon, global_opt=global_opt)  # Update the player's policy.
+        # Update the player's policy.
+        done, br = action_player.update_strategy(epsilon=epsilon, global_opt=global_opt, vertex_check=vertex_check,
+                                                 continuous=continuous)
 
         joint_strategy.append(br)
-        action = action_player.select_action()
+        action = action_player.play()
 
         for update_player in players:
-            update_player.update_empirical_strategy(action_id, action)
+            update_player.observe(action_id, action)
 
         if not done:
             converged = False
@@ -65,17 +94,67 @@ def alternating_variant(players, epsilon=0, global_opt=False):
     return converged, joint_strategy
 
 
+def calc_nash_gap(players, joint_strategy, br_utilities=None, global_opt=False, continuous=False):
+    """Calculate the Nash gap of a joint strategy, which is the largest utility any player gains by deviating from it.
+
+    Args:
+        players (List[FPPlayer]): A list of fictitious play players.
+        joint_strategy (List[ndarray]): The joint strategy to calculate the Nash gap of.
+        br_utilities (List[float], optional): The utility of each player's best response against the joint strategy,
+            when already known. Otherwise, the best responses are calculated. (Default value = None)
+        global_opt (bool, optional): Whether to use a global optimiser or a local one. (Default value = False)
+        continuous (bool, optional): Search best responses directly in the continuous strategy spaces of the
+            bijections attached to the utility functions. (Default value = False)
+
+    Returns:
+        float: The Nash gap of the joint strategy.
+    """
+    nash_gap = 0.
+
+    for player in players:
+        utility = calc_utility_from_joint_strat(player.u, player.pid, player.payoff_matrix, joint_strategy)
+        if br_utilities is None:
+            br = calc_best_response(player.u, player.pid, player.payoff_matrix, joint_strategy, global_opt=global_opt,
+                                    init_strat=joint_strategy[player.pid], store=player.store,
+                                    fingerprint=player.fingerprint, continuous=continuous)
+            br_joint_strategy = list(joint_strategy)
+            br_joint_strategy[player.pid] = br
+            br_utility = calc_utility_from_joint_strat(player.u, player.pid, player.payoff_matrix, br_joint_strategy)
+        else:
+            br_utility = br_utilities[player.pid]
+        nash_gap = max(nash_gap, br_utility - utility)
+
+    return nash_gap
+
+
 def fictitious_play(monfg, u_tpl, epsilon=0, max_iter=1000, init_joint_strategy=None, variant='alternating',
-                    global_opt=False, verify=True, early_stop=None, seed=None):
+                    global_opt=False, verify=True, early_stop=None, seed=None, parallel=None, max_workers=None,
+                    temperature=None, play='sampled', gap_threshold=None, schedule=None, continuous=False, store=None,
+                    fingerprint=None, track_gap=None):
     """Execute the fictitious play algorithm on a given MONFG and utility functions.
 
     There are two variants of the fictitious play algorithm implemented, simultaneous and alternating fictitious play.
     These variants are not equivalent in general. In the simultaneous variant, all players calculate their best-response
     strategy simultaneously. The alternating variant does it by alternating.
 
+    By default, players observe a sampled action from each strategy. With ``play='expected'``, they observe the full
+    mixed strategies instead, which makes a run deterministic for a given start and equal to the average over sampled
+    runs up to first order. The log then also reports how far sampling would have spread the empirical strategies.
+
+    When a temperature is given, players use smooth fictitious play instead. Rather than an exact best response, they
+    play a logit response which is perturbed by an entropy regulariser. This response is computed by a cheap
+    fixed-point iteration on the simplex and makes the dynamics stable in cyclic games.
+
+    The Nash gap of the empirical joint strategy is the largest utility any player gains from a best response to it. In
+    the simultaneous variant, the best responses of an iteration all respond to the empirical strategies, so the gap is
+    measured for free. Otherwise, measuring it takes an extra best response per player, which is only done when the gap
+    is tracked. Without tracking, a schedule is updated with the largest regret from the players' own updates instead
+    and the log holds NaN. When the gap drops to the threshold, the empirical joint strategy is returned, as that is
+    the joint strategy whose gap was measured.
+
     Note:
         At this point in time, the algorithm does not find cycles and will continue to execute until the maximum number
-        of iterations is reached.
+        of iterations is reached, unless a gap threshold is given.
 
     Args:
         monfg (List[ndarray]): A list of payoff matrices representing the MONFG.
@@ -91,12 +170,43 @@ def fictitious_play(monfg, u_tpl, epsilon=0, max_iter=1000, init_joint_strategy=
         early_stop (int, optional): The number of iterations the joint strategy has to be the same to allow an early
             stop. (Default value = None)
         seed (int, optional): The initial seed for the random number generator. (Default value = None)
+        parallel (str, optional): Compute the best responses of the simultaneous variant concurrently, using either
+            'thread' or 'process' workers. The process workers require picklable utility functions.
+            (Default value = None)
+        max_workers (int, optional): The number of parallel workers. Defaults to one per player. (Default value = None)
+        temperature (float, optional): The temperature for smooth fictitious play. When set, players use logit
+            responses instead of best responses and ``global_opt`` has no effect. The Nash gap then needs exact best
+            responses on top of the logit responses, so it is only measured when tracked. (Default value = None)
+        play (str, optional): How players observe each other, either 'sampled' actions or 'expected' play of the full
+            mixed strategies. (Default value = 'sampled')
+        gap_threshold (float, optional): Stop as soon as the estimated Nash gap drops to this threshold.
+            (Default value = None)
+        schedule (OptimiserSchedule, optional): A schedule that decides per iteration whether to use a global
+            optimiser. When given, this overrides ``global_opt``. (Default value = None)
+        continuous (bool, optional): Search best responses directly in the continuous strategy spaces of the
+            bijections attached to the utility functions, which requires a pure-strategy-equivalent game such as the
+            polynomial or Bertrand pricing game. (Default value = False)
+        store (BestResponseStore, optional): A persistent store to look up and save best responses, which can be shared
+            with parallel workers and other runs. (Default value = None)
+        fingerprint (str, optional): The fingerprint of the game for the store. By default, it is computed with
+            :func:`br_store.game_fingerprint`. (Default value = None)
+        track_gap (bool, optional): Measure the Nash gap every iteration, even when this takes extra best responses.
+            By default, it is tracked when a gap threshold is given. (Default value = None)
 
     Returns:
-        Tuple[bool, List[ndarray]]: Whether or not we reached a Nash equilibrium and the final joint strategy.
+        Tuple[bool, List[ndarray], List[List[float]]]: Whether or not we reached a Nash equilibrium, the final joint
+        strategy and a log. Each record in the log holds the iteration, the flattened joint strategy and the Nash gap
+        of the empirical joint strategy, or NaN when it was not measured. With expected play, it is followed by the
+        standard deviation that sampled play would have had on every empirical action probability.
 
     """
     rng = np.random.default_rng(seed=seed)
+    if store is not None and fingerprint is None:
+        fingerprint = game_fingerprint(monfg, u_tpl)
+    expected_play = play == 'expected'
+    if track_gap is None:
+        track_gap = gap_threshold is not None
+    reuse_best_responses = variant == 'simultaneous' and temperature is None  # The gap is measured for free.
 
     player_actions = monfg[0].shape[:-1]  # Get the number of actions available to each player.
     players = []  # A list to hold all the players.
@@ -108,7 +218,12 @@ def fictitious_play(monfg, u_tpl, epsilon=0, max_iter=1000, init_joint_strategy=
         init_strategy = None
         if init_joint_strategy is not None:
             init_strategy = init_joint_strategy[player_id]
-        player = FPPlayer(player_id, u, player_actions, payoff_matrix, init_strategy=init_strategy, rng=rng)
+        if temperature is None:
+            player = FPPlayer(player_id, u, player_actions, payoff_matrix, init_strategy=init_strategy, rng=rng,
+                              expected_play=expected_play, store=store, fingerprint=fingerprint)
+        else:
+            player = SmoothFPPlayer(player_id, u, player_actions, payoff_matrix, temperature=temperature,
+                                    init_strategy=init_strategy, rng=rng, expected_play=expected_play)
         players.append(player)
         joint_strategy.append(player.strategy)
 
@@ -118,25 +233,59 @@ def fictitious_play(monfg, u_tpl, epsilon=0, max_iter=1000, init_joint_strategy=
     num_same = 0
     nash_equilibrium = False  # The current joint strategy is not known to be a Nash equilibrium at this point.
 
-    if variant == 'simultaneous':
-        execute_iteration = simultaneous_variant
-    else:
-        execute_iteration = alternating_variant
+    if parallel is not None and temperature is not None:
+        raise ValueError('Parallel best responses are not supported for smooth fictitious play')
 
-    for i in range(max_iter):
-        if num_same >= early_stop:
-            break
-
-        converged, joint_strategy = execute_iteration(players, epsilon=epsilon, global_opt=global_opt)
-        record = [i] + [item for strat in joint_strategy for item in strat]
-        log.append(record)
+    if variant == 'simultaneous' and parallel is not None:
+        executor_context = BestResponseExecutor(monfg, u_tpl, backend=parallel, max_workers=max_workers, store=store,
+                                                fingerprint=fingerprint)
+    else:
+        executor_context = nullcontext()
 
-        if converged:  # If FP converged, check if we can guarantee a Nash equilibrium.
-            num_same += 1
+    with executor_context as executor:
+        if variant == 'simultaneous':
+            execute_iteration = partial(simultaneous_variant, executor=executor)
         else:
-            num_same = 0
+            execute_iteration = alternating_variant
+
+        for i in range(max_iter):
+            if num_same >= early_stop:
+                break
+
+            if schedule is None:
+                iteration_global_opt, vertex_check = global_opt, False
+            else:
+                iteration_global_opt, vertex_check = schedule.use_global(i), schedule.vertex_check
+
+            converged, joint_strategy = execute_iteration(players, epsilon=epsilon, global_opt=iteration_global_opt,
+                                                          vertex_check=vertex_check, continuous=continuous)
+            empirical_joint_strategy = players[0].calc_empirical_joint_strategy()  # Every player observes the same.
+            if reuse_best_responses or track_gap:
+                br_utilities = [player.br_utility for player in players] if reuse_best_responses else None
+                nash_gap = calc_nash_gap(players, empirical_joint_strategy, br_utilities=br_utilities,
+                                         global_opt=iteration_global_opt, continuous=continuous)
+            elif schedule is not None:
+                nash_gap = max(player.regret for player in players)  # An estimate that takes no extra optimisation.
+            else:
+                nash_gap = np.nan
+            if schedule is not None:
+                schedule.update(nash_gap, iteration_global_opt)
+            record = [i] + [item for strat in joint_strategy for item in strat] + [nash_gap]
+            if expected_play:  # Every player observes the same strategies, so any player can report the spread.
+                record += [item for std in players[0].calc_sampling_std() for item in std]
+            log.append(record)
+
+            if gap_threshold is not None and nash_gap <= gap_threshold:
+                joint_strategy = empirical_joint_strategy
+                break
+
+            if converged:  # If FP converged, check if we can guarantee a Nash equilibrium.
+                num_same += 1
+            else:
+                num_same = 0
 
     if verify:  # Check if the user wanted to verify.
-        nash_equilibrium = verify_nash(monfg, u_tpl, joint_strategy, epsilon=epsilon)
+        nash_equilibrium = verify_nash(monfg, u_tpl, joint_strategy, epsilon=epsilon, store=store,
+                                       fingerprint=fingerprint)
 
     return nash_equilibrium, joint_strategy, log
@@ -0,0 +1,155 @@
+import numpy as np
+
+from best_response import calc_best_response
+
+
+def pareto_dominated_actions(payoff_matrix, player):
+    """Find the actions of a player that are strictly Pareto dominated by another action.
+
+    An action is strictly Pareto dominated when another action gives a payoff vector that is at least as good in every
+    objective and different, against every joint action of the opponents. For utility functions that are strictly
+    increasing in the Pareto order, moving probability mass from a dominated action to its dominating action always
+    increases the utility. A dominated action is therefore never in the support of a best response.
+
+    Args:
+        payoff_matrix (ndarray): The payoff matrix of the player.
+        player (int): The player.
+
+    Returns:
+        List[int]: The dominated actions.
+    """
+    payoffs = np.moveaxis(payoff_matrix, player, 0)
+    payoffs = payoffs.reshape(payoffs.shape[0], -1, payoffs.shape[-1])  # Actions, opponent joint actions, objectives.
+    dominated = []
+
+    for action, action_payoffs in enumerate(payoffs):
+        weakly_better = np.all(payoffs >= action_payoffs, axis=2)
+        different = np.any(payoffs != action_payoffs, axis=2)
+        dominators = np.all(weakly_better & different, axis=1)
+        if np.any(dominators):
+            dominated.append(action)
+
+    return dominated
+
+
+def best_response_supported_actions(payoff_matrix, u, player, player_actions, samples=100, global_opt=False, tol=1e-6,
+                                    rng=None):
+    """Find the actions of a player that are in the support of a best response to sampled opponent strategies.
+
+    The opponent strategies are sampled uniformly from their simplices. This is evidence rather than proof, as an action
+    may only be used in a best response to strategies that were not sampled.
+
+    Args:
+        payoff_matrix (ndarray): The payoff matrix of the player.
+        u (callable): The utility function of the player.
+        player (int): The player.
+        player_actions (Tuple[int]): A tuple of actions indexed by player.
+        samples (int, optional): The number of sampled opponent strategies. (Default value = 100)
+        global_opt (bool, optional): Whether to use a global optimiser for the best responses. (Default value = False)
+        tol (float, optional): The minimum probability for an action to be in the support. (Default value = 1e-6)
+        rng (Generator, optional): A random number generator. (Default value = None)
+
+    Returns:
+        ndarray: The supported actions.
+    """
+    rng = rng if rng is not None else np.random.default_rng()
+    supported = np.zeros(player_actions[player], dtype=bool)
+
+    for _ in range(samples):
+        joint_strategy = [rng.dirichlet(np.ones(num_actions)) for num_actions in player_actions]
+        br = calc_best_response(u, player, payoff_matrix, joint_strategy, global_opt=global_opt, vertex_check=True)
+        supported |= br > tol
+
+    return np.flatnonzero(supported)
+
+
+def restrict_game(monfg, action_maps):
+    """Restrict an MONFG to a subset of the actions of each player.
+
+    Args:
+        monfg (List[ndarray]): An MONFG as a list of payoff matrices.
+        action_maps (List[ndarray]): The actions to keep for each player, as indexes in the full game.
+
+    Returns:
+        List[ndarray]: The restricted MONFG.
+    """
+    index = np.ix_(*action_maps, np.arange(monfg[0].shape[-1]))
+    return [payoff_matrix[index] for payoff_matrix in monfg]
+
+
+def reduce_game(monfg, u_tpl=None, monotone=False, samples=0, global_opt=False, tol=1e-6, seed=None):
+    """Reduce an MONFG by iteratively eliminating dominated actions.
+
+    With ``monotone=True``, strictly Pareto dominated actions are eliminated, which is sound for utility functions that
+    are strictly increasing in every objective. Removing actions of one player can make actions of another player
+    dominated, so this is repeated until no more actions are eliminated. Every Nash equilibrium of the full game then
+    only uses actions of the reduced game.
+
+    With ``samples > 0``, actions that are not used by any best response to sampled opponent strategies are eliminated
+    afterwards. This works for any utility function but is not sound, so equilibria of the reduced game should be lifted
+    with :func:`lift_joint_strategy` and verified in the full game.
+
+    Both reductions depend on what is known about the utility functions, so neither is applied by default.
+
+    Args:
+        monfg (List[ndarray]): An MONFG as a list of payoff matrices.
+        u_tpl (Tuple[callable], optional): A tuple of utility functions, required when sampling best responses.
+            (Default value = None)
+        monotone (bool, optional): Whether the utility functions are strictly increasing in every objective.
+            (Default value = False)
+        samples (int, optional): The number of sampled opponent strategies per player. (Default value = 0)
+        global_opt (bool, optional): Whether to use a global optimiser for the sampled best responses.
+            (Default value = False)
+        tol (float, optional): The minimum probability for an action to be in a best response. (Default value = 1e-6)
+        seed (int, optional): The seed for sampling opponent strategies. (Default value = None)
+
+    Returns:
+        Tuple[List[ndarray], List[ndarray]]: The reduced MONFG and, for every player, the actions of the full game that
+        remain in the order of the reduced game.
+    """
+    player_actions = monfg[0].shape[:-1]
+    action_maps = [np.arange(num_actions) for num_actions in player_actions]
+    reduced_monfg = list(monfg)
+
+    if monotone:
+        eliminated = True
+        while eliminated:
+            eliminated = False
+            for player in range(len(player_actions)):
+                dominated = pareto_dominated_actions(reduced_monfg[player], player)
+                if dominated:  # Strict dominance is acyclic, so at least one action always remains.
+                    keep = np.delete(np.arange(len(action_maps[player])), dominated)
+                    reduced_monfg = [np.take(payoff_matrix, keep, axis=player) for payoff_matrix in reduced_monfg]
+                    action_maps[player] = action_maps[player][keep]
+                    eliminated = True
+
+    if samples > 0:
+        rng = np.random.default_rng(seed=seed)
+        reduced_actions = reduced_monfg[0].shape[:-1]
+        keep = [best_response_supported_actions(payoff_matrix, u, player, reduced_actions, samples=samples,
+                                                global_opt=global_opt, tol=tol, rng=rng)
+                for player, (payoff_matrix, u) in enumerate(zip(reduced_monfg, u_tpl))]
+        reduced_monfg = restrict_game(reduced_monfg, keep)
+        action_maps = [action_map[player_keep] for action_map, player_keep in zip(action_maps, keep)]
+
+    return reduced_monfg, action_maps
+
+
+def lift_joint_strategy(reduced_joint_strategy, action_maps, player_actions):
+    """Lift a joint strategy of a reduced game to the full game.
+
+    Args:
+        reduced_joint_strategy (List[ndarray]): A joint strategy in the reduced game.
+        action_maps (List[ndarray]): The actions of the full game that remain for each player, as from
+            :func:`reduce_game`.
+        player_actions (Tuple[int]): A tuple of actions indexed by player in the full game.
+
+    Returns:
+        List[ndarray]: The joint strategy in the full game.
+    """
+    joint_strategy = []
+    for reduced_strategy, action_map, num_actions in zip(reduced_joint_strategy, action_maps, player_actions):
+        strategy = np.zeros(num_actions)
+        strategy[list(action_map)] = reduced_strategy
+        joint_strategy.append(strategy)
+    return joint_strategy
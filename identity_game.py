@@ -1,33 +1,93 @@
 import numpy as np
 
 
-def identity_game(player_actions):
+def identity_game(player_actions, dtype=np.float64):
     """Generate an identity game.
 
+    The payoff vector of a joint action is the concatenation of each player's action as a one-hot vector. Each
+    player's block of the payoff vector only depends on their own action, so it is written at once by broadcasting an
+    identity matrix along the other players' axes. All players receive the same read-only payoff matrix.
+
     Args:
         player_actions (Tuple[int]): A tuple of actions indexed by player.
+        dtype (dtype, optional): The type of the payoffs. As the payoffs are zero or one, float32 is exact and halves
+            the memory. (Default value = np.float64)
 
     Returns:
-        List[ndarray]: A list of payoff matrices representing the identity game.
+        List[ndarray]: A list of payoff matrices representing the identity game. As they are identical, every player
+        shares the same read-only array.
 
     """
-    payoffs = []
+    num_players = len(player_actions)
     joint_strat_length = np.sum(player_actions)  # Description length of a joint strategy.
-    payoffs_shape = player_actions + tuple([joint_strat_length])  # Shape of the payoff matrices.
-    payoff_matrix = np.zeros(payoffs_shape)  # Make the same payoff matrix for every player.
+    payoffs_shape = tuple(player_actions) + tuple([joint_strat_length])  # Shape of the payoff matrices.
+    payoff_matrix = np.zeros(payoffs_shape, dtype=dtype)
+
+    start = 0
+    for player, num_actions in enumerate(player_actions):  # One hot encode each player's action in their block.
+        block_shape = (1,) * player + (num_actions,) + (1,) * (num_players - player - 1) + (num_actions,)
+        payoff_matrix[..., start:start + num_actions] = np.eye(num_actions, dtype=dtype).reshape(block_shape)
+        start += num_actions
+
+    payoff_matrix.setflags(write=False)  # The payoff matrix is shared by all players.
+    return [payoff_matrix] * num_players
+
+
+class ImplicitIdentityPayoff:
+    """The payoff matrix of an identity game, without storing the dense tensor.
+
+    The payoff of a joint action in an identity game is the concatenation of each player's action as a one-hot vector.
+    This means the expected returns for a player can be written down directly from the joint strategy, so memory only
+    grows with the total number of actions rather than their product. The object mimics the parts of an ndarray used
+    by the best-response code.
+    """
+
+    def __init__(self, player_actions):
+        self.player_actions = tuple(player_actions)
+        self.shape = self.player_actions + (int(np.sum(player_actions)),)
+        self.ndim = len(self.shape)
+        self.offsets = np.concatenate(([0], np.cumsum(player_actions)[:-1])).astype(int)
+
+    def __getitem__(self, joint_action):
+        """Get the payoff vector of a joint action.
+
+        Args:
+            joint_action (Tuple[int]): An action for each player.
 
-    for joint_strat in np.ndindex(player_actions):  # Loop over joint strategies.
-        identity_vec = []  # Initialise the identity payoff. One hot encode joint strategies in this variable.
-        for player, action in enumerate(joint_strat):  # One hot encode each player's strategy.
-            strat_vec = np.zeros(player_actions[player])
-            strat_vec[action] = 1
-            identity_vec.extend(list(strat_vec))
-        payoff_matrix[joint_strat] = np.array(identity_vec)
+        Returns:
+            ndarray: The payoff vector.
+        """
+        payoff = np.zeros(self.shape[-1])
+        payoff[self.offsets + np.asarray(joint_action)] = 1
+        return payoff
 
-    payoffs.append(payoff_matrix)
+    def expected_returns(self, player, joint_strategy):
+        """Calculate the expected returns for a player's actions with a given joint strategy.
 
-    for _ in range(len(player_actions) - 1):  # We already have the first payoff matrix, so copy the rest now.
-        payoff_copy = np.copy(payoff_matrix)
-        payoffs.append(payoff_copy)
+        Args:
+            player (int): The player to calculate expected returns for.
+            joint_strategy (List[ndarray]): A list of each player's individual strategy.
 
-    return payoffs
+        Returns:
+            ndarray: The expected returns for the given player's actions.
+        """
+        num_actions = self.player_actions[player]
+        expected_returns = np.tile(np.concatenate(joint_strategy), (num_actions, 1))  # Opponents play their strategy.
+        start = self.offsets[player]
+        expected_returns[:, start:start + num_actions] = np.eye(num_actions)  # The player plays each action.
+        return expected_returns
+
+
+def implicit_identity_game(player_actions):
+    """Generate an identity game with implicit payoff matrices.
+
+    Args:
+        player_actions (Tuple[int]): A tuple of actions indexed by player.
+
+    Returns:
+        List[ImplicitIdentityPayoff]: A list of payoff matrices representing the identity game. As they are identical,
+        every player shares the same object.
+
+    """
+    payoff_matrix = ImplicitIdentityPayoff(player_actions)
+    return [payoff_matrix] * len(player_actions)
@@ -0,0 +1,115 @@
+import numpy as np
+
+from utils.strategies import normalise_strat
+
+try:
+    import numba
+except ImportError:
+    numba = None
+
+JIT_AVAILABLE = numba is not None
+
+
+def jit(func):
+    """Compile a function to native code with Numba when it is installed.
+
+    Without Numba, the function is returned unchanged. Compiled functions are cached on disk, so the compilation cost
+    is only paid the first time a kernel is used with new argument types.
+
+    Args:
+        func (callable): A function that only uses the subset of Python and NumPy supported by Numba.
+
+    Returns:
+        callable: The compiled function, or the function itself when Numba is not installed.
+    """
+    if numba is None:
+        return func
+    return numba.njit(cache=True)(func)
+
+
+@jit
+def _expected_vector_loop(strategy, expected_returns):
+    """Compute the expected vector of a normalised strategy with explicit loops.
+
+    Args:
+        strategy (ndarray): A strategy, which does not need to sum to one.
+        expected_returns (ndarray): The expected returns from the player's actions.
+
+    Returns:
+        ndarray: The expected vector.
+    """
+    num_actions, num_objectives = expected_returns.shape
+    total = 0.
+    for action in range(num_actions):
+        total += strategy[action]
+
+    expected_vec = np.zeros(num_objectives)
+    for action in range(num_actions):
+        weight = strategy[action] / total if total > 0 else 1. / num_actions
+        for objective in range(num_objectives):
+            expected_vec[objective] += weight * expected_returns[action, objective]
+    return expected_vec
+
+
+@jit
+def _two_player_expected_returns_loop(payoff_matrix, opponent_strategy, player):
+    """Compute the expected returns in a two-player game with explicit loops.
+
+    Args:
+        payoff_matrix (ndarray): The payoff matrix of the player.
+        opponent_strategy (ndarray): The strategy of the opponent.
+        player (int): The player, either zero or one.
+
+    Returns:
+        ndarray: The expected returns for the player's actions.
+    """
+    num_rows, num_cols, num_objectives = payoff_matrix.shape
+    num_actions = num_rows if player == 0 else num_cols
+    expected_returns = np.zeros((num_actions, num_objectives))
+    for row in range(num_rows):
+        for col in range(num_cols):
+            if player == 0:
+                action, weight = row, opponent_strategy[col]
+            else:
+                action, weight = col, opponent_strategy[row]
+            for objective in range(num_objectives):
+                expected_returns[action, objective] += weight * payoff_matrix[row, col, objective]
+    return expected_returns
+
+
+def expected_vector(strategy, expected_returns):
+    """Compute the expected vector of a strategy after normalising it.
+
+    Args:
+        strategy (ndarray): A strategy, which does not need to sum to one.
+        expected_returns (ndarray): The expected returns from the player's actions.
+
+    Returns:
+        ndarray: The expected vector.
+    """
+    if JIT_AVAILABLE:
+        return _expected_vector_loop(np.asarray(strategy, dtype=float), np.asarray(expected_returns, dtype=float))
+    return normalise_strat(strategy) @ expected_returns
+
+
+def two_player_expected_returns(payoff_matrix, opponent_strategy, player):
+    """Compute the expected returns for a player in a two-player game.
+
+    This is a fast path for :func:`best_response.calc_expected_returns`, which avoids the generic reshaping and
+    reductions over all opponents. Floating point payoff matrices are used in their own precision, but the expected
+    returns are always float64.
+
+    Args:
+        payoff_matrix (ndarray): The payoff matrix of the player.
+        opponent_strategy (ndarray): The strategy of the opponent.
+        player (int): The player, either zero or one.
+
+    Returns:
+        ndarray: The expected returns for the player's actions.
+    """
+    dtype = payoff_matrix.dtype if np.issubdtype(payoff_matrix.dtype, np.floating) else np.dtype(np.float64)
+    payoff_matrix = payoff_matrix.astype(dtype, copy=False)  # Keep float32 payoffs in float32.
+    opponent_strategy = np.asarray(opponent_strategy).astype(dtype, copy=False)
+    if JIT_AVAILABLE:
+        return _two_player_expected_returns_loop(payoff_matrix, opponent_strategy, player)
+    return np.tensordot(opponent_strategy, payoff_matrix, axes=(0, 1 - player)).astype(np.float64, copy=False)
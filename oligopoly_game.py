@@ -0,0 +1,70 @@
+import numpy as np
+
+from identity_game import implicit_identity_game
+from strategy_bijections import BoxBijection, one_simplex_coord_to_point, with_bijection
+
+
+def oligopoly_profits(prices, sigma, gamma, n, m, a):
+    """Compute the profits of all firms in a Bertrand oligopoly.
+
+    This generalises :func:`bertrand_pricing_game.bertrand_profits` to any number of firms. Every firm has its own
+    segment of captive customers with linear demand, while the type two customers spread their demand over all firms
+    according to a CES composite good. For two firms, this is exactly the Bertrand pricing game.
+
+    Args:
+        prices (ndarray): The price of each firm along the last axis. Leading axes are treated as a batch.
+        sigma (float): The elasticity of substitution between the products.
+        gamma (float): The elasticity of demand for the composite good.
+        n (float): The number of type two customers.
+        m (float): The unit cost of production for each firm.
+        a (float): All factors affecting price other than demand.
+
+    Returns:
+        ndarray: The profit of each firm, with the same shape as the prices.
+    """
+    powers = prices ** (1 - sigma)
+    composite = n * np.sum(powers, axis=-1, keepdims=True) ** ((gamma - sigma) / (-1 + sigma))
+    demand = a - prices + powers / prices * composite
+    return (prices - m) * demand
+
+
+def setup_oligopoly_game(num_firms, min_price, max_price, sigma, gamma, n, m, a):
+    """Set up a Bertrand oligopoly with any number of firms.
+
+    The MONFG is an identity game with two actions per firm, which is represented implicitly. Its memory therefore
+    grows linearly in the number of firms instead of exponentially.
+
+    Args:
+        num_firms (int): The number of firms.
+        min_price (float): The minimum price in the game.
+        max_price (float): The maximum price in the game.
+        sigma (float): The elasticity of substitution between the products.
+        gamma (float): The elasticity of demand for the composite good.
+        n (int): The number of type two customers.
+        m (float): The unit cost of production for each firm.
+        a (float): All factors affecting price other than demand.
+
+    Note:
+        The utility functions also accept a batch of payoff vectors stacked along the first axes, in which case they
+        return the utility of each payoff vector. Every utility function carries the bijection of its firm's price, so
+        best responses can be searched directly in the price interval.
+
+    Returns:
+        List[ImplicitIdentityPayoff], Tuple[callable]: The MONFG and a tuple of utility functions.
+    """
+    player_actions = (2,) * num_firms
+    monfg = implicit_identity_game(player_actions)
+
+    bijection = BoxBijection([min_price], [max_price])
+
+    def make_u(firm):
+        """Make the utility function of a firm."""
+        def u(payoff):
+            payoff = np.asarray(payoff)
+            coords = payoff.reshape(payoff.shape[:-1] + (num_firms, 2))  # A one-simplex coordinate per firm.
+            prices = one_simplex_coord_to_point(coords, min_price, max_price)
+            return oligopoly_profits(prices, sigma, gamma, n, m, a)[..., firm]
+        return with_bijection(u, bijection)
+
+    u_tpl = tuple(make_u(firm) for firm in range(num_firms))
+    return monfg, u_tpl
@@ -0,0 +1,61 @@
+import numpy as np
+
+
+class OptimiserSchedule:
+    """A schedule that decides when best responses should use a global optimiser.
+
+    By default, best responses are computed with a warm-started local optimiser. A global optimiser is only used
+    periodically and when the Nash gap has stagnated for a number of iterations. In all other iterations, a local best
+    response that is beaten by a pure strategy falls back to the global optimiser as well.
+
+    Note:
+        A schedule keeps track of the progress of a single run. Use a new schedule for every run.
+    """
+
+    def __init__(self, period=10, patience=5, vertex_check=True, min_improvement=1e-8):
+        """Create a schedule.
+
+        Args:
+            period (int, optional): Use a global optimiser every this many iterations, starting with the first. Set to
+                None to disable periodic global optimisation. (Default value = 10)
+            patience (int, optional): The number of iterations without improvement of the Nash gap after which to use
+                a global optimiser. Set to None to disable. (Default value = 5)
+            vertex_check (bool, optional): Whether to fall back to a global optimiser for local best responses that
+                are beaten by a pure strategy. (Default value = True)
+            min_improvement (float, optional): The decrease in the Nash gap that counts as an improvement.
+                (Default value = 1e-8)
+        """
+        self.period = period
+        self.patience = patience
+        self.vertex_check = vertex_check
+        self.min_improvement = min_improvement
+        self.best_gap = np.inf
+        self.num_stagnant = 0
+
+    def use_global(self, iteration):
+        """Decide whether to use a global optimiser in this iteration.
+
+        Args:
+            iteration (int): The current iteration.
+
+        Returns:
+            bool: Whether to use a global optimiser.
+        """
+        periodic = self.period is not None and iteration % self.period == 0
+        stagnated = self.patience is not None and self.num_stagnant >= self.patience
+        return periodic or stagnated
+
+    def update(self, nash_gap, used_global):
+        """Update the schedule with the Nash gap after an iteration.
+
+        Args:
+            nash_gap (float): The estimated Nash gap after the iteration.
+            used_global (bool): Whether a global optimiser was used in the iteration.
+        """
+        if nash_gap < self.best_gap - self.min_improvement:
+            self.best_gap = nash_gap
+            self.num_stagnant = 0
+        elif used_global:
+            self.num_stagnant = 0  # Give the local optimiser another chance after a global iteration.
+        else:
+            self.num_stagnant += 1
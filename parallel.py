@@ -0,0 +1,133 @@
+import threading
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+from best_response import calc_best_response
+from shared_game import SharedMONFG
+
+_worker_state = threading.local()  # The game as seen by the current worker.
+
+
+def init_worker(monfg, u_tpl, store=None, fingerprint=None):
+    """Store the game in a worker so that it is transferred only once instead of with every task.
+
+    Args:
+        monfg (List[ndarray] | SharedMONFG): A list of payoff matrices representing the MONFG, or an MONFG in shared
+            memory which the worker attaches to instead of receiving a copy.
+        u_tpl (Tuple[callable]): A tuple of utility functions.
+        store (BestResponseStore, optional): A persistent store to look up and save best responses, which the workers
+            share with each other and with later runs. (Default value = None)
+        fingerprint (str, optional): The fingerprint of the game, required when using a store. (Default value = None)
+    """
+    _worker_state.store = store
+    _worker_state.fingerprint = fingerprint
+    if isinstance(monfg, SharedMONFG):
+        _worker_state.shared_game = monfg  # Keep the shared memory attached for as long as the worker lives.
+        monfg = monfg.monfg
+    _worker_state.monfg = monfg
+    _worker_state.u_tpl = u_tpl
+
+
+def worker_game():
+    """Get the game that was stored in the current worker by :func:`init_worker`.
+
+    Returns:
+        Tuple[List[ndarray], Tuple[callable]]: The MONFG and the tuple of utility functions.
+    """
+    return _worker_state.monfg, _worker_state.u_tpl
+
+
+def worker_best_response(player, joint_strategy, init_strat=None, epsilon=0, global_opt=False, vertex_check=False,
+                         continuous=False):
+    """Calculate a best response in a worker for the game that was stored by :func:`init_worker`.
+
+    Args:
+        player (int): The player to calculate a best response for.
+        joint_strategy (List[ndarray]): A list of each player's individual strategy.
+        init_strat (ndarray, optional): The initial guess for the best response. (Default value = None)
+        epsilon (float, optional): Tolerance parameter to calculate an epsilon best-response strategy.
+            (Default value = 0)
+        global_opt (bool, optional): Whether to use a global optimiser or a local one. (Default value = False)
+        vertex_check (bool, optional): Whether to fall back to a global optimiser when a local best response is
+            beaten by a pure strategy. (Default value = False)
+        continuous (bool, optional): Search the best response directly in the continuous strategy space of the
+            bijection attached to the utility function. (Default value = False)
+
+    Returns:
+        ndarray: A best response strategy.
+    """
+    monfg, u_tpl = worker_game()
+    u = u_tpl[player]
+    payoff_matrix = monfg[player]
+    return calc_best_response(u, player, payoff_matrix, joint_strategy, epsilon=epsilon, global_opt=global_opt,
+                              init_strat=init_strat, vertex_check=vertex_check, store=_worker_state.store,
+                              fingerprint=_worker_state.fingerprint, continuous=continuous)
+
+
+class BestResponseExecutor:
+    """An executor that computes the best responses of all players concurrently.
+
+    The game is handed to each worker once when it starts. Afterwards, only the joint strategies are sent with a task.
+    With the ``'thread'`` backend the workers simply share the payoff tensors, while the ``'process'`` backend places
+    them in shared memory with a :class:`shared_game.SharedMONFG` that all worker processes attach to, so the payoff
+    tensors are never copied per worker. The shared memory is freed when the executor shuts down. The process backend
+    sidesteps the GIL, which matters when using a global optimiser, but requires the utility functions to be
+    picklable, i.e. defined at the module level.
+
+    When a :class:`br_store.BestResponseStore` is given, every worker looks up and saves its best responses in it, so
+    best responses are shared between the workers and with later runs.
+    """
+
+    def __init__(self, monfg, u_tpl, backend='thread', max_workers=None, store=None, fingerprint=None):
+        if backend == 'thread':
+            executor_cls = ThreadPoolExecutor
+        elif backend == 'process':
+            executor_cls = ProcessPoolExecutor
+        else:
+            raise ValueError(f'Unknown parallel backend {backend}, expected either thread or process')
+
+        if max_workers is None:
+            max_workers = len(u_tpl)  # One worker per player suffices for a single iteration.
+
+        self.backend = backend
+        self.shared_game = SharedMONFG(monfg) if backend == 'process' else None
+        game = monfg if self.shared_game is None else self.shared_game
+        self.executor = executor_cls(max_workers=max_workers, initializer=init_worker,
+                                     initargs=(game, u_tpl, store, fingerprint))
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.shutdown()
+
+    def best_responses(self, joint_strategies, init_strats, epsilon=0, global_opt=False, vertex_check=False,
+                       continuous=False):
+        """Calculate a best response for every player concurrently.
+
+        Args:
+            joint_strategies (List[List[ndarray]]): The joint strategy each player responds to, indexed by player.
+            init_strats (List[ndarray]): The initial guess for the best response of each player.
+            epsilon (float, optional): Tolerance parameter to calculate an epsilon best-response strategy.
+                (Default value = 0)
+            global_opt (bool, optional): Whether to use a global optimiser or a local one. (Default value = False)
+            vertex_check (bool, optional): Whether to fall back to a global optimiser when a local best response
+                is beaten by a pure strategy. (Default value = False)
+            continuous (bool, optional): Search the best response directly in the continuous strategy space of the
+                bijection attached to the utility function. (Default value = False)
+
+        Returns:
+            List[ndarray]: The best response of each player, ordered by player regardless of completion order.
+        """
+        futures = []
+        for player, (joint_strategy, init_strat) in enumerate(zip(joint_strategies, init_strats)):
+            future = self.executor.submit(worker_best_response, player, joint_strategy, init_strat=init_strat,
+                                          epsilon=epsilon, global_opt=global_opt, vertex_check=vertex_check,
+                                          continuous=continuous)
+            futures.append(future)
+        return [future.result() for future in futures]
+
+    def shutdown(self):
+        """Shut down the workers and free the shared memory of the game."""
+        self.executor.shutdown()
+        if self.shared_game is not None:
+            self.shared_game.close()
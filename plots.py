@@ -1,9 +1,11 @@
 import matplotlib
 import matplotlib.pyplot as plt
 import numpy as np
-import pandas as pd
 import seaborn as sns
 
+from trajectory_stats import (TrajectoryAggregator, aggregate_log_file, aggregate_log_file_by_class,
+                              final_rows_of_log_file)
+
 matplotlib.rcParams['pdf.fonttype'] = 42
 matplotlib.rcParams['ps.fonttype'] = 42
 
@@ -38,10 +40,14 @@ def plot_points(filetype, name, df, equilibrium=None, min_x=0, max_x=5000, min_y
                 label2='$p_y$', y_label='Price'):
     """Plot the learning curve of strategies over time.
 
+    The data is either the raw log of an experiment, which seaborn aggregates itself, or a summary from
+    :meth:`trajectory_stats.TrajectoryAggregator.summary`. A summary is plotted directly as the mean with a band of one
+    standard deviation, which is the same figure without grouping every raw row of the log.
+
     Args:
         filetype (str): The filetype to save the plots as. (Default value = 'pdf')
         name (str): The name to save the plot under.
-        df (DataFrame): The data of the experiment.
+        df (DataFrame): The log or the summary of the experiment.
         equilibrium (List[Tuple[float, str]], optional): A list of equilibrium points and their labels.
             (Default value = None)
         min_x (int, optional): The minimum value on the x-axis. (Default value = 0)
@@ -52,8 +58,16 @@ def plot_points(filetype, name, df, equilibrium=None, min_x=0, max_x=5000, min_y
         label2 (str, optional): The label for the second player. (Default value = '$p_y$')
         y_label (str, optional): The label across the y-axis. (Default value = 'Price')
     """
-    ax = sns.lineplot(x='iteration', y='player1', linewidth=2.0, data=df, ci='sd', label=label1)
-    ax = sns.lineplot(x='iteration', y='player2', linewidth=2.0, data=df, ci='sd', label=label2)
+    if 'player1_mean' in df.columns:
+        ax = plt.gca()
+        for player, label in (('player1', label1), ('player2', label2)):
+            mean = df[f'{player}_mean']
+            std = df[f'{player}_std']
+            line, = ax.plot(df['iteration'], mean, linewidth=2.0, label=label)
+            ax.fill_between(df['iteration'], mean - std, mean + std, color=line.get_color(), alpha=0.2, linewidth=0)
+    else:
+        ax = sns.lineplot(x='iteration', y='player1', linewidth=2.0, data=df, ci='sd', label=label1)
+        ax = sns.lineplot(x='iteration', y='player2', linewidth=2.0, data=df, ci='sd', label=label2)
 
     if equilibrium is None:
         equilibrium = []
@@ -81,40 +95,30 @@ def plot_results(filetype='pdf'):
     """
     name1 = "polynomial_game"
     y_label1 = 'Strategy'
-    df1 = pd.read_csv(f'{name1}.csv')
     label1, label2 = ('$x$', '$y$')
     equilibrium1 = [(0.39680, '$x^\\ast$'), (0.62996, '$y^\\ast$')]
     min_x, max_x = (0, 200)
     min_y, max_y = (-1, 1)
+    df1 = aggregate_log_file(f'{name1}.csv', (min_y, max_y)).summary()
     plot_points(filetype, name1, df1, equilibrium=equilibrium1, min_x=min_x, max_x=max_x, min_y=min_y, max_y=max_y,
                 label1=label1, label2=label2, y_label=y_label1)
 
     name2 = "bertrand_price_game_full"
-    df = pd.read_csv(f'{name2}.csv')
-    runs = 1000
-    iterations = 200
-    df2 = []
-    df3 = []
-    df4 = []
-    mistakes = 0
-    for i in range(runs):
-        run_data = df.iloc[i * iterations:(i + 1) * iterations]
-        last_row = run_data.iloc[-1]
-        p1 = last_row['player1']
-        p2 = last_row['player2']
-
-        if p1 < 3 and p2 > 24:
-            df2.append(run_data)
-        elif p1 > 24 and p2 < 3:
-            df3.append(run_data)
-        else:
-            df4.append(run_data)
-            mistakes += 1
-            print(p1, p2)
-            print(f"Run {last_row['run']}, Mistake: {mistakes}")
-
-    df2 = pd.concat(df2)
-    df3 = pd.concat(df3)
+    last_rows = final_rows_of_log_file(f'{name2}.csv')  # Classify every run by its final prices.
+    p1 = last_rows['player1'].to_numpy()
+    p2 = last_rows['player2'].to_numpy()
+    low_high = (p1 < 3) & (p2 > 24)
+    high_low = (p1 > 24) & (p2 < 3)
+
+    mistakes = last_rows[~(low_high | high_low)]
+    for mistake, (run, p1, p2) in enumerate(mistakes[['run', 'player1', 'player2']].to_numpy(), start=1):
+        print(p1, p2)
+        print(f"Run {run}, Mistake: {mistake}")
+
+    run_classes = {**dict.fromkeys(last_rows['run'][low_high], 'low_high'),
+                   **dict.fromkeys(last_rows['run'][high_low], 'high_low')}
+    aggregators = aggregate_log_file_by_class(f'{name2}.csv', run_classes, (0, 30))
+    df2, df3 = (aggregators.get(label, TrajectoryAggregator((0, 30))).summary() for label in ('low_high', 'high_low'))
 
     y_label2 = 'Price'
     name2 = "bertrand_price_game1"
@@ -135,8 +139,7 @@ def plot_results(filetype='pdf'):
 
     y_label4 = 'Price'
     name4 = "bertrand_price_game_restricted"
-    df4 = pd.read_csv(f'{name4}.csv')
-    name4 = "bertrand_price_game_restricted"
+    df4 = aggregate_log_file(f'{name4}.csv', (0, 30)).summary()
     label1, label2 = ('$p_x$', '$p_y$')
     equilibrium4 = [(22.987, '$p^\\ast_x$'), (22.987, '$p^\\ast_y$')]
     min_x, max_x = (0, 10)
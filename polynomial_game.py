@@ -1,7 +1,10 @@
 from identity_game import identity_game
-from strategy_bijections import one_simplex_coord_to_point
+from kernels import jit
+from strategy_bijections import BoxBijection, one_simplex_coord_to_point, with_bijection
+from symbolic_utility import make_symbolic_utility
 
 
+@jit
 def u1(x, y):
     """The utility function for player 1 in the polynomial game.
 
@@ -15,6 +18,7 @@ def u1(x, y):
     return 2 * x * (y ** 2) - x ** 2 - y
 
 
+@jit
 def u2(x, y):
     """The utility function for player 2 in the polynomial game.
 
@@ -35,6 +39,11 @@ def setup_polynomial_game(min_x, max_x):
         min_x (float): The minimum value in the strategy interval.
         max_x (float): The maximum value in the strategy interval.
 
+    Note:
+        The utility functions also accept a batch of payoff vectors stacked along the first axes, in which case they
+        return the utility of each payoff vector. Every utility function carries the bijection of its player's
+        strategy, so best responses can be searched directly in the strategy interval.
+
     Returns:
         List[ndarray], Tuple[callable]: The MONFG and a tuple of utility functions.
     """
@@ -42,14 +51,40 @@ def setup_polynomial_game(min_x, max_x):
     monfg = identity_game(player_actions)
 
     def um1(payoff):
-        x = one_simplex_coord_to_point(payoff[0:2], min_x, max_x)
-        y = one_simplex_coord_to_point(payoff[2:4], min_x, max_x)
+        x = one_simplex_coord_to_point(payoff[..., 0:2], min_x, max_x)
+        y = one_simplex_coord_to_point(payoff[..., 2:4], min_x, max_x)
         return u1(x, y)
 
     def um2(payoff):
-        x = one_simplex_coord_to_point(payoff[0:2], min_x, max_x)
-        y = one_simplex_coord_to_point(payoff[2:4], min_x, max_x)
+        x = one_simplex_coord_to_point(payoff[..., 0:2], min_x, max_x)
+        y = one_simplex_coord_to_point(payoff[..., 2:4], min_x, max_x)
         return u2(x, y)
 
-    u_tpl = (um1, um2)
+    bijection = BoxBijection([min_x], [max_x])
+    u_tpl = (with_bijection(um1, bijection), with_bijection(um2, bijection))
+    return monfg, u_tpl
+
+
+def setup_symbolic_polynomial_game(min_x, max_x, jit=False):
+    """Set up the polynomial game with utility functions that are compiled from their symbolic expressions.
+
+    This is the same game as :func:`setup_polynomial_game`, but the utility functions also provide their exact gradient
+    and Hessian. This requires SymPy and, when using ``jit=True``, Numba.
+
+    Args:
+        min_x (float): The minimum value in the strategy interval.
+        max_x (float): The maximum value in the strategy interval.
+        jit (bool, optional): Whether to JIT compile the utility functions with Numba. (Default value = False)
+
+    Returns:
+        List[ndarray], Tuple[callable]: The MONFG and a tuple of utility functions.
+    """
+    player_actions = (2, 2)
+    monfg = identity_game(player_actions)
+    variables = ('x', 'y')
+    intervals = [(min_x, max_x), (min_x, max_x)]
+    um1 = make_symbolic_utility('2 * x * y ** 2 - x ** 2 - y', variables, intervals, jit=jit)
+    um2 = make_symbolic_utility('- (2 * x * y ** 2 - x ** 2 - y)', variables, intervals, jit=jit)
+    bijection = BoxBijection([min_x], [max_x])
+    u_tpl = (with_bijection(um1, bijection), with_bijection(um2, bijection))
     return monfg, u_tpl
@@ -0,0 +1,79 @@
+import numpy as np
+
+from best_response import verify_nash
+from utils.strategies import make_strat_from_action
+
+
+def calc_utility_tensor(payoff_matrix, u, batched=True):
+    """Compute the utility of every joint action in a payoff matrix.
+
+    Args:
+        payoff_matrix (ndarray): The payoff matrix of a player.
+        u (callable): The utility function of the player.
+        batched (bool, optional): Whether the utility function accepts a batch of payoff vectors stacked along the first
+            axes, as the utilities of the built-in games do. Otherwise, it is called once per joint action.
+            (Default value = True)
+
+    Returns:
+        ndarray: The utility of each joint action, with one axis per player.
+    """
+    if batched:
+        return np.asarray(u(payoff_matrix), dtype=float)
+    return np.apply_along_axis(u, -1, payoff_matrix)
+
+
+def find_psne(monfg, u_tpl, tol=1e-12, batched=True, verify=True, epsilon=0):
+    """Find all pure strategy Nash equilibria of an MONFG under SER.
+
+    Under SER, the utility of a pure joint strategy is simply the utility of its payoff vector. We evaluate this for all
+    joint actions at once and take the best pure deviation of each player with a maximum along their own axis. A joint
+    action where every player attains this maximum has no profitable pure deviation, which is necessary for a PSNE.
+
+    It is not sufficient when the utility functions are not linear. A player's utility of a mixed deviation is then not
+    an average of the utilities of pure deviations, so it can beat a pure joint strategy even when no pure deviation
+    does. This is the case in the polynomial and Bertrand pricing games. The remaining candidates are therefore verified
+    against mixed deviations with :func:`best_response.verify_nash`, which is only safe to skip for linear or convex
+    utility functions.
+
+    Args:
+        monfg (List[ndarray]): An MONFG as a list of payoff matrices.
+        u_tpl (Tuple[callable]): A tuple of utility functions.
+        tol (float, optional): The tolerance in the utility comparison. (Default value = 1e-12)
+        batched (bool, optional): Whether the utility functions accept a batch of payoff vectors.
+            (Default value = True)
+        verify (bool, optional): Verify the candidates against mixed deviations with a global optimiser. Only disable
+            this for linear or convex utility functions. (Default value = True)
+        epsilon (float, optional): The tolerance to accept approximate Nash equilibria in the verification.
+            (Default value = 0)
+
+    Returns:
+        ndarray: The PSNE as an array with the joint action of each equilibrium on a row.
+    """
+    is_candidate = None
+    for player, (payoff_matrix, u) in enumerate(zip(monfg, u_tpl)):
+        utilities = calc_utility_tensor(payoff_matrix, u, batched=batched)
+        best_deviations = np.max(utilities, axis=player, keepdims=True)
+        is_best_response = utilities >= best_deviations - tol
+        is_candidate = is_best_response if is_candidate is None else is_candidate & is_best_response
+
+    candidates = np.argwhere(is_candidate)
+    if not verify:
+        return candidates
+
+    player_actions = monfg[0].shape[:-1]
+    is_psne = [verify_nash(monfg, u_tpl, psne_to_joint_strategy(candidate, player_actions), epsilon=epsilon)
+               for candidate in candidates]
+    return candidates[np.array(is_psne, dtype=bool)]
+
+
+def psne_to_joint_strategy(psne, player_actions):
+    """Turn a PSNE into a joint strategy, for instance to use it as the initial joint strategy of FP or IBR.
+
+    Args:
+        psne (array_like): The action of each player in the PSNE.
+        player_actions (Tuple[int]): A tuple of actions indexed by player.
+
+    Returns:
+        List[ndarray]: A pure joint strategy.
+    """
+    return [make_strat_from_action(action, num_actions) for action, num_actions in zip(psne, player_actions)]
@@ -0,0 +1,116 @@
+import weakref
+from multiprocessing import shared_memory
+
+import numpy as np
+
+
+def _attach(name):
+    """Attach to an existing shared memory block without letting this process unlink it on exit.
+
+    Note:
+        Before Python 3.13, attaching always registers the block with the resource tracker. Worker processes share the
+        tracker of the process that created them, which already tracks the block, so the registration has no effect.
+        Unregistering it would remove the owner's registration instead.
+
+    Args:
+        name (str): The name of the shared memory block.
+
+    Returns:
+        SharedMemory: The attached block.
+    """
+    try:
+        return shared_memory.SharedMemory(name=name, track=False)
+    except TypeError:
+        return shared_memory.SharedMemory(name=name)
+
+
+def _release(blocks, unlink):
+    """Close shared memory blocks and optionally free them.
+
+    Args:
+        blocks (List[SharedMemory]): The shared memory blocks.
+        unlink (bool): Whether to free the blocks, which only the process that created them should do.
+    """
+    for block in blocks:
+        try:
+            block.close()
+        except BufferError:  # A view on the block is still alive, the memory is unmapped when it is collected.
+            pass
+        if unlink:
+            try:
+                block.unlink()
+            except FileNotFoundError:
+                pass
+
+
+class SharedMONFG:
+    """An MONFG with its payoff tensors in shared memory, for worker processes.
+
+    The payoff tensors are copied into shared memory once, where payoff tensors that are the same object, as in an
+    identity game, are only stored once. Pickling the container only sends the names of the shared memory blocks, so a
+    worker process attaches to the same memory instead of receiving a copy of the game. The payoff tensors are exposed
+    as read-only arrays through :attr:`monfg`.
+
+    The process that creates the container owns the shared memory and frees it when the container is closed, is
+    garbage collected or the interpreter exits. Should that process crash, the resource tracker of multiprocessing
+    frees the memory instead.
+    """
+
+    def __init__(self, monfg):
+        """Copy an MONFG into shared memory.
+
+        Args:
+            monfg (List[ndarray]): An MONFG as a list of payoff matrices.
+        """
+        self.tensor_specs = []  # The name, shape and type of every distinct payoff tensor.
+        self.player_tensors = []  # The index of the payoff tensor of each player.
+        blocks = []
+        tensor_ids = {}
+
+        for payoffs in monfg:  # The game keeps every original object alive, so their ids are unique.
+            if id(payoffs) not in tensor_ids:
+                payoff_matrix = np.asarray(payoffs)  # Lists and memmaps may convert to a new object every time.
+                block = shared_memory.SharedMemory(create=True, size=max(1, payoff_matrix.nbytes))
+                view = np.ndarray(payoff_matrix.shape, dtype=payoff_matrix.dtype, buffer=block.buf)
+                view[...] = payoff_matrix
+                tensor_ids[id(payoffs)] = len(self.tensor_specs)
+                self.tensor_specs.append((block.name, payoff_matrix.shape, payoff_matrix.dtype.str))
+                blocks.append(block)
+            self.player_tensors.append(tensor_ids[id(payoffs)])
+
+        self._open(blocks, owner=True)
+
+    def _open(self, blocks, owner):
+        """Make the read-only views on the shared memory blocks.
+
+        Args:
+            blocks (List[SharedMemory]): The shared memory block of each distinct payoff tensor.
+            owner (bool): Whether this process created the blocks.
+        """
+        self.owner = owner
+        tensors = []
+        for block, (_, shape, dtype) in zip(blocks, self.tensor_specs):
+            tensor = np.ndarray(shape, dtype=np.dtype(dtype), buffer=block.buf)
+            tensor.flags.writeable = False
+            tensors.append(tensor)
+        self.monfg = [tensors[tensor] for tensor in self.player_tensors]
+        self._finalizer = weakref.finalize(self, _release, blocks, owner)
+
+    def __getstate__(self):
+        return {'tensor_specs': self.tensor_specs, 'player_tensors': self.player_tensors}
+
+    def __setstate__(self, state):
+        self.tensor_specs = state['tensor_specs']
+        self.player_tensors = state['player_tensors']
+        self._open([_attach(name) for name, _, _ in self.tensor_specs], owner=False)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def close(self):
+        """Close the shared memory in this process, which also frees it when this process created it."""
+        self.monfg = []
+        self._finalizer()
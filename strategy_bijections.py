@@ -5,14 +5,14 @@ def one_simplex_coord_to_point(coord, min_x, max_x):
     """Compute the map of the unit one-simplex coordinate to a point in the correct line segment.
 
     Args:
-        coord (ndarray): A coordinate in a unit one-simplex.
+        coord (ndarray): A coordinate in a unit one-simplex, or a batch of coordinates along the last axis.
         min_x (float): The minimum value in the interval.
         max_x (float): The maximum value in the interval.
 
     Returns:
-        float: A point in the interval.
+        float | ndarray: A point in the interval, or a point for each coordinate in the batch.
     """
-    return min_x + coord[0] * (max_x - min_x)
+    return min_x + np.asarray(coord)[..., 0] * (max_x - min_x)
 
 
 def one_simplex_point_to_coord(point, min_x, max_x):
@@ -30,3 +30,125 @@ def one_simplex_point_to_coord(point, min_x, max_x):
     y_coord = 1 - x_coord
     coord = np.array([x_coord, y_coord])
     return coord
+
+
+class SimplexBijection:
+    """A bijection between the unit k-simplex and a k-dimensional simplex in space given by its vertices.
+
+    Coordinates on the unit simplex are the barycentric coordinates of a point with respect to the vertices. The
+    inverse transform matrix is computed once, so both directions are a single matrix product for a batch of points.
+    """
+
+    def __init__(self, vertices):
+        """Create the bijection.
+
+        Args:
+            vertices (array_like): The k + 1 vertices of the simplex as an array of shape (k + 1, k).
+
+        Raises:
+            ValueError: When the vertices do not span a non-degenerate k-dimensional simplex.
+        """
+        self.vertices = np.asarray(vertices, dtype=float)
+        num_vertices, self.dim = self.vertices.shape
+        if num_vertices != self.dim + 1:
+            raise ValueError(f'A {self.dim}-dimensional simplex requires {self.dim + 1} vertices, got {num_vertices}')
+
+        edges = (self.vertices[:-1] - self.vertices[-1]).T  # The edges from the last vertex as columns.
+        if np.linalg.matrix_rank(edges) < self.dim:
+            raise ValueError('The vertices span a degenerate simplex')
+        self.transform = np.linalg.inv(edges)
+
+    def coord_to_point(self, coords):
+        """Map unit simplex coordinates to points.
+
+        Args:
+            coords (ndarray): Coordinates on the unit k-simplex along the last axis, with any leading batch axes.
+
+        Returns:
+            ndarray: The points in the simplex, with the k dimensions along the last axis.
+        """
+        return np.asarray(coords) @ self.vertices
+
+    def point_to_coord(self, points):
+        """Map points to unit simplex coordinates.
+
+        Args:
+            points (ndarray): Points in the simplex with the k dimensions along the last axis, with any leading batch
+                axes.
+
+        Returns:
+            ndarray: The barycentric coordinates on the unit k-simplex along the last axis.
+        """
+        weights = (np.asarray(points) - self.vertices[-1]) @ self.transform.T
+        last_weight = 1 - np.sum(weights, axis=-1, keepdims=True)
+        return np.concatenate((weights, last_weight), axis=-1)
+
+
+class BoxBijection:
+    """A bijection between the unit k-simplex and a k-dimensional box.
+
+    This uses stick breaking. The i-th dimension of the box is the fraction of the probability mass that remains after
+    the first i - 1 actions which is assigned to action i. For k = 1, this is the same map as
+    :func:`one_simplex_coord_to_point` and :func:`one_simplex_point_to_coord`. The map is a bijection between the
+    interiors. On the boundary of the simplex where no mass remains, the later dimensions are set to their minimum.
+    """
+
+    def __init__(self, lows, highs):
+        """Create the bijection.
+
+        Args:
+            lows (array_like): The minimum value in each dimension of the box.
+            highs (array_like): The maximum value in each dimension of the box.
+        """
+        self.lows = np.asarray(lows, dtype=float)
+        self.highs = np.asarray(highs, dtype=float)
+        self.widths = self.highs - self.lows
+        self.dim = len(self.lows)
+        self.bounds = list(zip(self.lows, self.highs))
+
+    def coord_to_point(self, coords):
+        """Map unit simplex coordinates to points.
+
+        Args:
+            coords (ndarray): Coordinates on the unit k-simplex along the last axis, with any leading batch axes.
+
+        Returns:
+            ndarray: The points in the box, with the k dimensions along the last axis.
+        """
+        coords = np.asarray(coords, dtype=float)[..., :-1]
+        remaining = 1 - np.cumsum(coords, axis=-1) + coords  # The mass left before assigning each action.
+        fractions = np.divide(coords, remaining, out=np.zeros_like(coords), where=remaining > 0)
+        return self.lows + fractions * self.widths
+
+    def point_to_coord(self, points):
+        """Map points to unit simplex coordinates.
+
+        Args:
+            points (ndarray): Points in the box with the k dimensions along the last axis, with any leading batch axes.
+
+        Returns:
+            ndarray: The coordinates on the unit k-simplex along the last axis.
+        """
+        fractions = (np.asarray(points, dtype=float) - self.lows) / self.widths
+        remaining = np.cumprod(1 - fractions, axis=-1)
+        before = np.concatenate((np.ones_like(remaining[..., :1]), remaining[..., :-1]), axis=-1)
+        return np.concatenate((fractions * before, remaining[..., -1:]), axis=-1)
+
+
+def with_bijection(u, bijection):
+    """Attach a bijection to a utility function.
+
+    This marks the utility function as one of a pure-strategy-equivalent game, where the player's mixed strategy is the
+    unit simplex coordinate of a point in a continuous strategy space. Best responses can then be searched for directly
+    in the continuous strategy space.
+
+    Args:
+        u (callable): The utility function of a player.
+        bijection (BoxBijection): The bijection between the player's mixed strategies and their continuous strategies.
+            Any object with ``bounds`` and a ``point_to_coord`` method may be used.
+
+    Returns:
+        callable: The same utility function.
+    """
+    u.bijection = bijection
+    return u
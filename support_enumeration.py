@@ -0,0 +1,367 @@
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from itertools import product
+
+import numpy as np
+import scipy.optimize as scopt
+
+from best_response import calc_expected_returns, objective, passes_vertex_check, utility_gradient, verify_nash
+from game_reduction import lift_joint_strategy, reduce_game
+from parallel import init_worker, worker_game
+from shared_game import SharedMONFG
+from utils.strategies import enumerate_supports
+
+
+def support_profiles(candidate_actions, max_support_size=None):
+    """Generate the support profiles, ordered by their total size and then by how balanced they are.
+
+    Small and balanced supports are the most likely to hold an equilibrium, so they are tried first [1]. The profiles
+    are generated lazily per combination of support sizes, so the search can stop or prune them without ever holding
+    all profiles in memory.
+
+    References:
+        .. [1] Porter, R, Nudelman, E, Shoham, Y (2008) "Simple search methods for finding a Nash equilibrium",
+            Games and Economic Behavior.
+
+    Args:
+        candidate_actions (List[ndarray]): The actions of each player that may be in a support.
+        max_support_size (int, optional): The maximum size of each player's support. (Default value = None)
+
+    Yields:
+        Tuple[Tuple[int]]: A support profile, with a support for each player.
+    """
+    max_sizes = [len(candidates) if max_support_size is None else min(len(candidates), max_support_size)
+                 for candidates in candidate_actions]
+
+    def size_order(sizes):
+        """Order the sizes of a profile by their total and then by their spread."""
+        return sum(sizes), max(sizes) - min(sizes)
+
+    for sizes in sorted(product(*[range(1, max_size + 1) for max_size in max_sizes]), key=size_order):
+        player_supports = []
+        for candidates, size in zip(candidate_actions, sizes):
+            supports = enumerate_supports(len(candidates), min_size=size, max_size=size)
+            player_supports.append([tuple(candidates[list(support)]) for support in supports])
+        yield from product(*player_supports)
+
+
+def is_conditionally_dominated(monfg, profile):
+    """Check whether an action in a support is dominated given the supports of the opponents.
+
+    An action is conditionally dominated when another action of the same player gives a payoff vector that is at least
+    as good in every objective against every pure profile of the opponents' supports, and better at least once [1].
+    For utility functions which are strictly increasing in every objective, moving probability to the dominating action
+    then strictly increases the utility, so no equilibrium has this support profile.
+
+    References:
+        .. [1] Porter, R, Nudelman, E, Shoham, Y (2008) "Simple search methods for finding a Nash equilibrium",
+            Games and Economic Behavior.
+
+    Args:
+        monfg (List[ndarray]): An MONFG as a list of payoff matrices.
+        profile (Tuple[Tuple[int]]): The support of each player.
+
+    Returns:
+        bool: Whether an action in the support profile is conditionally dominated.
+    """
+    player_actions = monfg[0].shape[:-1]
+
+    for player, (payoff_matrix, support) in enumerate(zip(monfg, profile)):
+        index = [np.arange(num_actions) if opponent == player else list(opp_support)
+                 for opponent, (num_actions, opp_support) in enumerate(zip(player_actions, profile))]
+        payoffs = np.moveaxis(payoff_matrix[np.ix_(*index)], player, 0).reshape(player_actions[player], -1)
+        at_least = np.all(payoffs[:, None] >= payoffs[None, :], axis=2)  # Row action at least as good as column.
+        better = np.any(payoffs[:, None] > payoffs[None, :], axis=2)
+        if np.any(np.any(at_least & better, axis=0)[list(support)]):
+            return True
+    return False
+
+
+def is_pruned(monfg, u_tpl, profile, monotone=False, epsilon=1e-6):
+    """Check whether a support profile can be skipped without solving it.
+
+    A pure profile is checked against pure deviations right away. When the utility functions are strictly increasing in
+    every objective, profiles with a conditionally dominated action are skipped as well.
+
+    Args:
+        monfg (List[ndarray]): An MONFG as a list of payoff matrices.
+        u_tpl (Tuple[callable]): A tuple of utility functions.
+        profile (Tuple[Tuple[int]]): The support of each player.
+        monotone (bool, optional): Whether the utility functions are strictly increasing in every objective.
+            (Default value = False)
+        epsilon (float, optional): The tolerance for a pure deviation to be an improvement. (Default value = 1e-6)
+
+    Returns:
+        bool: Whether the support profile cannot hold an equilibrium.
+    """
+    if all(len(support) == 1 for support in profile):
+        joint_strategy = lift_joint_strategy([np.ones(1)] * len(profile), profile, monfg[0].shape[:-1])
+        return not all(passes_pure_deviations(monfg, u_tpl, joint_strategy, player, tol=epsilon)
+                       for player in range(len(profile)))
+    return monotone and is_conditionally_dominated(monfg, profile)
+
+
+def expand_free_probabilities(free_probabilities, profile):
+    """Complete the free probabilities of each support with the probability of the last action in the support.
+
+    Args:
+        free_probabilities (ndarray): The probabilities of all but the last action in each support, concatenated.
+        profile (Tuple[Tuple[int]]): The support of each player.
+
+    Returns:
+        List[ndarray]: The strategy of each player on their support.
+    """
+    restricted_joint_strategy = []
+    start = 0
+    for support in profile:
+        end = start + len(support) - 1
+        free = free_probabilities[start:end]
+        restricted_joint_strategy.append(np.append(free, 1 - np.sum(free)))
+        start = end
+    return restricted_joint_strategy
+
+
+def support_conditions(free_probabilities, monfg, u_tpl, profile):
+    """Compute the residuals of the first-order equilibrium conditions for a support profile.
+
+    At an equilibrium under SER, every player's strategy is a local maximum of their utility on the face of the simplex
+    spanned by their support. This means the partial derivatives of the utility with respect to the probability of each
+    action in the support are equal. For linear utility functions, these are exactly the indifference conditions of
+    classical support enumeration. The strategies sum to one by construction, so there is one equation per unknown.
+
+    Args:
+        free_probabilities (ndarray): The probabilities of all but the last action in each support, concatenated.
+        monfg (List[ndarray]): An MONFG as a list of payoff matrices.
+        u_tpl (Tuple[callable]): A tuple of utility functions.
+        profile (Tuple[Tuple[int]]): The support of each player.
+
+    Returns:
+        ndarray: The residuals.
+    """
+    player_actions = monfg[0].shape[:-1]
+    restricted_joint_strategy = expand_free_probabilities(free_probabilities, profile)
+    joint_strategy = lift_joint_strategy(restricted_joint_strategy, profile, player_actions)
+    residuals = []
+
+    for player, (payoff_matrix, u, support) in enumerate(zip(monfg, u_tpl, profile)):
+        expected_returns = calc_expected_returns(player, payoff_matrix, joint_strategy)
+        expected_vec = joint_strategy[player] @ expected_returns
+        gradient = expected_returns[list(support)] @ utility_gradient(expected_vec, u)
+        residuals.extend(gradient[1:] - gradient[0])
+
+    return np.array(residuals)
+
+
+def solve_support(monfg, u_tpl, profile, epsilon=1e-6, guesses=5, tol=1e-8, support_tol=1e-8, rng=None):
+    """Search for an equilibrium with a given support profile.
+
+    The first-order conditions from :func:`support_conditions` are solved with a root finder, starting from the uniform
+    strategy on each support and from random strategies for any further guesses. A solution is rejected when it does
+    not put a positive probability on every action of its support, or when a pure deviation beats it. Both checks are
+    cheap compared to global verification.
+
+    Args:
+        monfg (List[ndarray]): An MONFG as a list of payoff matrices.
+        u_tpl (Tuple[callable]): A tuple of utility functions.
+        profile (Tuple[Tuple[int]]): The support of each player.
+        epsilon (float, optional): The tolerance for a pure deviation to be an improvement. (Default value = 1e-6)
+        guesses (int, optional): The number of starting points for the root finder. (Default value = 5)
+        tol (float, optional): The maximum residual of an accepted solution. (Default value = 1e-8)
+        support_tol (float, optional): The minimum probability of an action in the support. (Default value = 1e-8)
+        rng (Generator, optional): The random number generator for the further guesses. (Default value = None)
+
+    Returns:
+        List[ndarray] | None: The candidate equilibrium, or None when the support profile was rejected.
+    """
+    rng = rng if rng is not None else np.random.default_rng()
+    player_actions = monfg[0].shape[:-1]
+    num_players = len(player_actions)
+    init_guesses = [np.concatenate([np.full(len(support) - 1, 1 / len(support)) for support in profile])]
+    for _ in range(guesses - 1):
+        init_guesses.append(np.concatenate([rng.dirichlet(np.ones(len(support)))[:-1] for support in profile]))
+
+    for guess in init_guesses:
+        if len(guess) == 0:  # A pure joint strategy, which leaves nothing to solve.
+            free_probabilities = guess
+        else:
+            res = scopt.root(support_conditions, guess, args=(monfg, u_tpl, profile))
+            if np.max(np.abs(res['fun'])) > tol:
+                continue
+            free_probabilities = res['x']
+
+        restricted_joint_strategy = expand_free_probabilities(free_probabilities, profile)
+        if min(np.min(strategy) for strategy in restricted_joint_strategy) < support_tol:
+            continue  # The solution belongs to a smaller support profile or is not a strategy.
+
+        joint_strategy = lift_joint_strategy(restricted_joint_strategy, profile, player_actions)
+        if all(passes_pure_deviations(monfg, u_tpl, joint_strategy, player, tol=epsilon)
+               for player in range(num_players)):
+            return joint_strategy
+    return None
+
+
+def passes_pure_deviations(monfg, u_tpl, joint_strategy, player, tol=1e-6):
+    """Check that no pure deviation of a player beats their strategy in a joint strategy.
+
+    Args:
+        monfg (List[ndarray]): An MONFG as a list of payoff matrices.
+        u_tpl (Tuple[callable]): A tuple of utility functions.
+        joint_strategy (List[ndarray]): The joint strategy.
+        player (int): The player to check.
+        tol (float, optional): The tolerance for a pure deviation to be an improvement. (Default value = 1e-6)
+
+    Returns:
+        bool: Whether no pure deviation is an improvement.
+    """
+    expected_returns = calc_expected_returns(player, monfg[player], joint_strategy)
+    utility = objective(joint_strategy[player], expected_returns, u_tpl[player])
+    return passes_vertex_check(expected_returns, u_tpl[player], utility, tol=tol)
+
+
+def worker_solve_support(profile, seed=None, **kwargs):
+    """Search for an equilibrium with a given support profile in the game that was stored by :func:`init_worker`.
+
+    Args:
+        profile (Tuple[Tuple[int]]): The support of each player.
+        seed (SeedSequence, optional): The seed for the random number generator of this search. (Default value = None)
+        **kwargs: The keyword arguments for :func:`solve_support`.
+
+    Returns:
+        List[ndarray] | None: The candidate equilibrium, or None when the support profile was rejected.
+    """
+    monfg, u_tpl = worker_game()
+    return solve_support(monfg, u_tpl, profile, rng=np.random.default_rng(seed), **kwargs)
+
+
+def submit_lazily(executor, tasks, window, **kwargs):
+    """Solve support profiles in an executor while keeping only a bounded number of them in flight.
+
+    Args:
+        executor (Executor): The executor whose workers were initialised with :func:`init_worker`.
+        tasks (Iterable[Tuple[Tuple[Tuple[int]], SeedSequence]]): The support profiles with the seed to solve them with.
+        window (int): The maximum number of profiles that are submitted but not yet collected.
+        **kwargs: The keyword arguments for :func:`solve_support`.
+
+    Yields:
+        List[ndarray] | None: The candidate equilibrium of every profile, in the order of the profiles.
+    """
+    pending = deque()
+    for profile, seed in tasks:
+        pending.append(executor.submit(worker_solve_support, profile, seed=seed, **kwargs))
+        if len(pending) >= window:
+            yield pending.popleft().result()
+    while pending:
+        yield pending.popleft().result()
+
+
+def is_known_equilibrium(equilibria, joint_strategy, tol=1e-4):
+    """Check whether a joint strategy is close to an equilibrium that was already found.
+
+    Args:
+        equilibria (List[List[ndarray]]): The equilibria found so far.
+        joint_strategy (List[ndarray]): The joint strategy to check.
+        tol (float, optional): The maximum difference in action probabilities. (Default value = 1e-4)
+
+    Returns:
+        bool: Whether the joint strategy is a known equilibrium.
+    """
+    flat_strategy = np.concatenate(joint_strategy)
+    return any(np.allclose(np.concatenate(equilibrium), flat_strategy, atol=tol) for equilibrium in equilibria)
+
+
+def collect_equilibria(monfg, u_tpl, candidates, epsilon=1e-6, verify=True):
+    """Collect the distinct candidates that are Nash equilibria.
+
+    Args:
+        monfg (List[ndarray]): An MONFG as a list of payoff matrices.
+        u_tpl (Tuple[callable]): A tuple of utility functions.
+        candidates (Iterable[List[ndarray] | None]): The candidate equilibria, with None for rejected profiles.
+        epsilon (float, optional): The tolerance to accept approximate Nash equilibria. (Default value = 1e-6)
+        verify (bool, optional): Verify candidates with a global optimiser. (Default value = True)
+
+    Returns:
+        List[List[ndarray]]: The Nash equilibria in the order of the candidates.
+    """
+    equilibria = []
+    for joint_strategy in candidates:
+        if joint_strategy is None or is_known_equilibrium(equilibria, joint_strategy):
+            continue
+        if not verify or verify_nash(monfg, u_tpl, joint_strategy, epsilon=epsilon):
+            equilibria.append(joint_strategy)
+    return equilibria
+
+
+def support_enumeration(monfg, u_tpl, epsilon=1e-6, guesses=5, monotone=False, max_support_size=None, verify=True,
+                        parallel=None, max_workers=None, seed=None):
+    """Find the Nash equilibria of an MONFG under SER by enumerating support profiles.
+
+    Under SER, the utility is not linear in a player's own strategy. The indifference conditions of classical support
+    enumeration therefore become conditions on the gradient of the utility, which are solved per support profile by
+    :func:`solve_support`. Support profiles are tried from small to large. Candidates that survive the cheap support and
+    pure-deviation checks are verified globally with :func:`verify_nash`.
+
+    Support profiles are generated lazily and pruned by :func:`is_pruned` before they are solved. When the utility
+    functions are strictly increasing in every objective, ``monotone=True`` leaves out the actions that
+    :func:`game_reduction.reduce_game` eliminates from all supports, which shrinks the number of support profiles
+    exponentially, and also skips profiles with conditionally dominated actions. Every profile is solved with its own
+    random number generator, spawned from ``seed``, so the guesses differ between profiles and workers while the result
+    does not depend on how the profiles are scheduled.
+
+    Note:
+        The first-order conditions may have several solutions on a support and the root finder only returns one per
+        starting point. The result is therefore every equilibrium this search reaches, rather than a guaranteed
+        complete set. A game without any Nash equilibrium under SER, which is possible, gives an empty list.
+
+    Args:
+        monfg (List[ndarray]): An MONFG as a list of payoff matrices.
+        u_tpl (Tuple[callable]): A tuple of utility functions.
+        epsilon (float, optional): The tolerance to accept approximate Nash equilibria. (Default value = 1e-6)
+        guesses (int, optional): The number of starting points for the root finder per support profile.
+            (Default value = 5)
+        monotone (bool, optional): Whether the utility functions are strictly increasing in every objective.
+            (Default value = False)
+        max_support_size (int, optional): The maximum size of each player's support. (Default value = None)
+        verify (bool, optional): Verify candidates with a global optimiser. (Default value = True)
+        parallel (str, optional): Solve support profiles concurrently using either 'thread' or 'process' workers. The
+            process workers require picklable utility functions. (Default value = None)
+        max_workers (int, optional): The number of parallel workers. (Default value = None)
+        seed (int, optional): The seed for the random guesses of the root finder. (Default value = None)
+
+    Returns:
+        List[List[ndarray]]: The Nash equilibria that were found, ordered by the size of their supports.
+    """
+    if monotone:
+        _, candidate_actions = reduce_game(monfg, monotone=True)
+    else:
+        candidate_actions = [np.arange(num_actions) for num_actions in monfg[0].shape[:-1]]
+
+    root_seed = np.random.SeedSequence(seed)
+    profiles = (profile for profile in support_profiles(candidate_actions, max_support_size=max_support_size)
+                if not is_pruned(monfg, u_tpl, profile, monotone=monotone, epsilon=epsilon))
+    tasks = ((profile, root_seed.spawn(1)[0]) for profile in profiles)
+    solve_kwargs = {'epsilon': epsilon, 'guesses': guesses}
+
+    if parallel is None:
+        candidates = (solve_support(monfg, u_tpl, profile, rng=np.random.default_rng(profile_seed), **solve_kwargs)
+                      for profile, profile_seed in tasks)
+        return collect_equilibria(monfg, u_tpl, candidates, epsilon=epsilon, verify=verify)
+
+    if parallel == 'thread':
+        executor_cls = ThreadPoolExecutor
+        shared_game = None
+    elif parallel == 'process':
+        executor_cls = ProcessPoolExecutor
+        shared_game = SharedMONFG(monfg)  # Worker processes attach to the payoff tensors instead of copying them.
+    else:
+        raise ValueError(f'Unknown parallel backend {parallel}, expected either thread or process')
+
+    game = monfg if shared_game is None else shared_game
+    window = 2 * (max_workers or os.cpu_count() or 1)  # Keep every worker busy without submitting all profiles.
+    try:
+        with executor_cls(max_workers=max_workers, initializer=init_worker, initargs=(game, u_tpl)) as executor:
+            candidates = submit_lazily(executor, tasks, window, **solve_kwargs)
+            return collect_equilibria(monfg, u_tpl, candidates, epsilon=epsilon, verify=verify)
+    finally:
+        if shared_game is not None:
+            shared_game.close()
@@ -0,0 +1,140 @@
+import numpy as np
+
+try:
+    import sympy
+except ImportError:
+    sympy = None
+
+try:
+    import numba
+except ImportError:
+    numba = None
+
+
+def interval_map(intervals):
+    """Compute the affine map from payoff vectors of an identity game to points in the continuous strategy space.
+
+    Every continuous variable lies in an interval and is represented by a player with two actions, as in
+    :func:`polynomial_game.setup_polynomial_game`. The point of variable :math:`i` is then
+    :math:`min_i + c_{2i} (max_i - min_i)`, where :math:`c` is the payoff vector.
+
+    Args:
+        intervals (List[Tuple[float, float]]): The minimum and maximum value of each variable.
+
+    Returns:
+        Tuple[ndarray, ndarray]: The matrix and offset of the map, such that the points are ``payoff @ matrix.T +
+        offset``.
+    """
+    num_variables = len(intervals)
+    matrix = np.zeros((num_variables, 2 * num_variables))
+    offset = np.zeros(num_variables)
+    for variable, (min_x, max_x) in enumerate(intervals):
+        matrix[variable, 2 * variable] = max_x - min_x
+        offset[variable] = min_x
+    return matrix, offset
+
+
+def _evaluate(funcs, points):
+    """Evaluate compiled functions on a batch of points and stack their values along the last axis.
+
+    Args:
+        funcs (List[callable]): The compiled functions, taking one argument per variable.
+        points (ndarray): The points with the variables along the last axis.
+
+    Returns:
+        ndarray: The value of each function, broadcast to the batch shape of the points.
+    """
+    args = [points[..., variable] for variable in range(points.shape[-1])]
+    batch_shape = points.shape[:-1]
+    values = [np.broadcast_to(np.asarray(func(*args), dtype=float), batch_shape) for func in funcs]
+    return np.stack(values, axis=-1)
+
+
+def compile_expression(expression, variables, jit=False):
+    """Compile a symbolic expression into a batched function, its gradient and its Hessian.
+
+    The derivatives are computed symbolically and every expression is turned into a NumPy function with
+    ``sympy.lambdify``. When ``jit=True``, these functions are additionally compiled with Numba.
+
+    Args:
+        expression (str | sympy.Expr): The expression, either as a SymPy expression or a string that SymPy can parse.
+        variables (Sequence[str | sympy.Symbol]): The variables of the expression, in order.
+        jit (bool, optional): Whether to JIT compile the functions with Numba. (Default value = False)
+
+    Raises:
+        ImportError: When SymPy is not installed or, with ``jit=True``, Numba is not installed.
+
+    Returns:
+        Tuple[callable, callable, callable]: The function, its gradient and its Hessian. Each takes an array with the
+        variables along the last axis and returns the value, gradient or Hessian for every point in the batch.
+    """
+    if sympy is None:
+        raise ImportError('Compiling symbolic utilities requires sympy')
+    if jit and numba is None:
+        raise ImportError('JIT compiling symbolic utilities requires numba')
+
+    variables = [sympy.Symbol(variable) if isinstance(variable, str) else variable for variable in variables]
+    expression = sympy.sympify(expression, locals={variable.name: variable for variable in variables})
+    gradient_exprs = [sympy.diff(expression, variable) for variable in variables]
+    hessian_exprs = [sympy.diff(gradient_expr, variable) for gradient_expr in gradient_exprs for variable in variables]
+
+    def compile_func(expr):
+        """Compile a single expression."""
+        func = sympy.lambdify(variables, expr, modules='numpy')
+        if jit:
+            func = numba.njit(func)
+        return func
+
+    value_func = compile_func(expression)
+    gradient_funcs = [compile_func(expr) for expr in gradient_exprs]
+    hessian_funcs = [compile_func(expr) for expr in hessian_exprs]
+    num_variables = len(variables)
+
+    def func(points):
+        return _evaluate([value_func], np.asarray(points, dtype=float))[..., 0][()]  # A float for a single point.
+
+    def gradient(points):
+        return _evaluate(gradient_funcs, np.asarray(points, dtype=float))
+
+    def hessian(points):
+        points = np.asarray(points, dtype=float)
+        return _evaluate(hessian_funcs, points).reshape(points.shape[:-1] + (num_variables, num_variables))
+
+    return func, gradient, hessian
+
+
+def make_symbolic_utility(expression, variables, intervals, jit=False):
+    """Make the utility function of a pure-strategy-equivalent game from a symbolic expression.
+
+    The utility function takes payoff vectors of the identity game, maps them to points with :func:`interval_map` and
+    evaluates the compiled expression. As the map is affine, the gradient and Hessian with respect to the payoff vector
+    follow from the chain rule. They are attached to the utility function as its ``gradient`` and ``hessian``
+    attributes, which lets :func:`best_response.optimise_policy` use exact gradients.
+
+    Args:
+        expression (str | sympy.Expr): The utility as an expression of the continuous strategies.
+        variables (Sequence[str | sympy.Symbol]): The continuous strategy of each player, in order.
+        intervals (List[Tuple[float, float]]): The minimum and maximum value of each variable.
+        jit (bool, optional): Whether to JIT compile the functions with Numba. (Default value = False)
+
+    Returns:
+        callable: The utility function, which also accepts a batch of payoff vectors stacked along the first axes.
+    """
+    func, point_gradient, point_hessian = compile_expression(expression, variables, jit=jit)
+    matrix, offset = interval_map(intervals)
+
+    def u(payoff):
+        points = np.asarray(payoff) @ matrix.T + offset
+        return func(points)
+
+    def gradient(payoff):
+        points = np.asarray(payoff) @ matrix.T + offset
+        return point_gradient(points) @ matrix
+
+    def hessian(payoff):
+        points = np.asarray(payoff) @ matrix.T + offset
+        return matrix.T @ point_hessian(points) @ matrix
+
+    u.gradient = gradient
+    u.hessian = hessian
+    return u
@@ -0,0 +1,198 @@
+import numpy as np
+import pandas as pd
+
+
+class TrajectoryAggregator:
+    """Streaming per-iteration statistics of the strategies of many runs.
+
+    Rows of a log are added in batches of any size, for instance one run at a time during an experiment or chunks of a
+    CSV file. The mean and variance per iteration and player are merged with the running values as in Welford's
+    algorithm, generalised to batches [1]. Quantiles are read from a histogram per iteration and player over a fixed
+    range of values, so memory only grows with the number of iterations and never with the number of runs.
+
+    References:
+        .. [1] Chan, T F, Golub, G H, LeVeque, R J (1979) "Updating formulae and a pairwise algorithm for computing
+            sample variances", Technical Report STAN-CS-79-773, Stanford University.
+    """
+
+    def __init__(self, value_range, players=('player1', 'player2'), bins=200):
+        """Create an empty aggregator.
+
+        Args:
+            value_range (Tuple[float, float]): The range of the histograms for the quantiles. Values outside of the
+                range are counted in the first or last bin.
+            players (Tuple[str], optional): The columns of the players in the log.
+                (Default value = ('player1', 'player2'))
+            bins (int, optional): The number of histogram bins. (Default value = 200)
+        """
+        self.players = tuple(players)
+        self.edges = np.linspace(value_range[0], value_range[1], bins + 1)
+        self.counts = np.zeros(0, dtype=int)
+        self.means = np.zeros((0, len(self.players)))
+        self.m2 = np.zeros((0, len(self.players)))  # The sum of squared differences from the mean.
+        self.histograms = np.zeros((0, len(self.players), bins), dtype=int)
+
+    def _grow(self, num_iterations):
+        """Make room for the statistics of more iterations.
+
+        Args:
+            num_iterations (int): The number of iterations to keep statistics for.
+        """
+        extra = num_iterations - len(self.counts)
+        if extra > 0:
+            self.counts = np.concatenate((self.counts, np.zeros(extra, dtype=int)))
+            self.means = np.vstack((self.means, np.zeros((extra, len(self.players)))))
+            self.m2 = np.vstack((self.m2, np.zeros((extra, len(self.players)))))
+            self.histograms = np.concatenate((self.histograms, np.zeros((extra,) + self.histograms.shape[1:], int)))
+
+    def update(self, iterations, values):
+        """Add a batch of rows from a log.
+
+        Args:
+            iterations (array_like): The iteration of every row.
+            values (array_like): The value of every player on every row, with a column per player.
+        """
+        iterations = np.asarray(iterations, dtype=int)
+        values = np.asarray(values, dtype=float).reshape(len(iterations), len(self.players))
+        num_iterations = int(iterations.max()) + 1
+        self._grow(num_iterations)
+
+        batch_counts = np.bincount(iterations, minlength=num_iterations)
+        seen = batch_counts > 0
+        batch_means = np.zeros((num_iterations, len(self.players)))
+        batch_m2 = np.zeros((num_iterations, len(self.players)))
+        for player in range(len(self.players)):
+            sums = np.bincount(iterations, weights=values[:, player], minlength=num_iterations)
+            batch_means[seen, player] = sums[seen] / batch_counts[seen]
+            deviations = values[:, player] - batch_means[iterations, player]
+            batch_m2[:, player] = np.bincount(iterations, weights=deviations ** 2, minlength=num_iterations)
+
+        counts = self.counts[:num_iterations]
+        total = counts + batch_counts
+        delta = batch_means - self.means[:num_iterations]
+        weight = np.divide(batch_counts, total, out=np.zeros(num_iterations), where=total > 0)[:, None]
+        self.means[:num_iterations] += delta * weight
+        self.m2[:num_iterations] += batch_m2 + delta ** 2 * (counts[:, None] * weight)
+        self.counts[:num_iterations] = total
+
+        num_bins = len(self.edges) - 1
+        bin_idx = np.clip(np.searchsorted(self.edges, values, side='right') - 1, 0, num_bins - 1)
+        flat_idx = (iterations[:, None] * len(self.players) + np.arange(len(self.players))) * num_bins + bin_idx
+        hist_size = num_iterations * len(self.players) * num_bins
+        self.histograms[:num_iterations] += np.bincount(flat_idx.ravel(), minlength=hist_size).reshape(
+            num_iterations, len(self.players), num_bins)
+
+    def update_from_frame(self, df):
+        """Add the rows of a log in a DataFrame.
+
+        Args:
+            df (DataFrame): A log with an 'iteration' column and a column for every player.
+        """
+        self.update(df['iteration'].to_numpy(), df[list(self.players)].to_numpy())
+
+    def quantiles(self, q):
+        """Estimate a quantile of every player's value per iteration from the histograms.
+
+        The quantile is interpolated linearly within its bin, so it is accurate up to the width of a bin.
+
+        Args:
+            q (float): The quantile, between zero and one.
+
+        Returns:
+            ndarray: The quantile per iteration, with a column per player.
+        """
+        cumulative = np.cumsum(self.histograms, axis=-1)
+        target = q * cumulative[..., -1:]
+        bin_idx = np.minimum(np.sum(cumulative < target, axis=-1), len(self.edges) - 2)
+        below = np.take_along_axis(cumulative, bin_idx[..., None], axis=-1)[..., 0]
+        in_bin = np.take_along_axis(self.histograms, bin_idx[..., None], axis=-1)[..., 0]
+        previous = below - in_bin
+        fraction = np.divide(target[..., 0] - previous, in_bin, out=np.zeros(in_bin.shape), where=in_bin > 0)
+        width = self.edges[1] - self.edges[0]
+        return self.edges[bin_idx] + fraction * width
+
+    def summary(self, quantiles=(0.25, 0.5, 0.75)):
+        """Summarise the statistics per iteration.
+
+        Args:
+            quantiles (Tuple[float], optional): The quantiles to include. (Default value = (0.25, 0.5, 0.75))
+
+        Returns:
+            DataFrame: One row per iteration with its number of runs and, for every player, the columns
+            '{player}_mean', '{player}_std' with the sample standard deviation and '{player}_q{percentage}'.
+        """
+        seen = self.counts > 0
+        summary = {'iteration': np.flatnonzero(seen), 'runs': self.counts[seen]}
+        variances = np.divide(self.m2, np.maximum(self.counts - 1, 1)[:, None])
+        quantile_values = {q: self.quantiles(q) for q in quantiles}
+
+        for player_idx, player in enumerate(self.players):
+            summary[f'{player}_mean'] = self.means[seen, player_idx]
+            summary[f'{player}_std'] = np.sqrt(variances[seen, player_idx])
+            for q, values in quantile_values.items():
+                summary[f'{player}_q{q * 100:g}'] = values[seen, player_idx]
+        return pd.DataFrame(summary)
+
+
+def aggregate_log_file(filename, value_range, players=('player1', 'player2'), bins=200, chunksize=100000):
+    """Aggregate a log saved by :func:`experiments.save_logs` in a single pass over chunks of the file.
+
+    Args:
+        filename (str): The CSV file of the log.
+        value_range (Tuple[float, float]): The range of the histograms for the quantiles.
+        players (Tuple[str], optional): The columns of the players in the log.
+            (Default value = ('player1', 'player2'))
+        bins (int, optional): The number of histogram bins. (Default value = 200)
+        chunksize (int, optional): The number of rows to read at once. (Default value = 100000)
+
+    Returns:
+        TrajectoryAggregator: The aggregated log.
+    """
+    aggregator = TrajectoryAggregator(value_range, players=players, bins=bins)
+    for chunk in pd.read_csv(filename, chunksize=chunksize):
+        aggregator.update_from_frame(chunk)
+    return aggregator
+
+
+def final_rows_of_log_file(filename, chunksize=100000):
+    """Collect the final row of every run in a log saved by :func:`experiments.save_logs` in a pass over chunks.
+
+    Args:
+        filename (str): The CSV file of the log.
+        chunksize (int, optional): The number of rows to read at once. (Default value = 100000)
+
+    Returns:
+        DataFrame: The final row of every run.
+    """
+    final_rows = None
+    for chunk in pd.read_csv(filename, chunksize=chunksize):
+        chunk_final_rows = chunk.groupby('run').tail(1)
+        if final_rows is not None:  # A run that continues in this chunk ends here instead.
+            chunk_final_rows = pd.concat((final_rows, chunk_final_rows)).groupby('run').tail(1)
+        final_rows = chunk_final_rows
+    return final_rows
+
+
+def aggregate_log_file_by_class(filename, run_classes, value_range, players=('player1', 'player2'), bins=200,
+                                chunksize=100000):
+    """Aggregate the runs of every class in a log saved by :func:`experiments.save_logs` in a single pass over chunks.
+
+    Args:
+        filename (str): The CSV file of the log.
+        run_classes (Dict[int, Hashable]): The class of every run to aggregate. Runs without a class are skipped.
+        value_range (Tuple[float, float]): The range of the histograms for the quantiles.
+        players (Tuple[str], optional): The columns of the players in the log.
+            (Default value = ('player1', 'player2'))
+        bins (int, optional): The number of histogram bins. (Default value = 200)
+        chunksize (int, optional): The number of rows to read at once. (Default value = 100000)
+
+    Returns:
+        Dict[Hashable, TrajectoryAggregator]: The aggregated runs of every class.
+    """
+    aggregators = {label: TrajectoryAggregator(value_range, players=players, bins=bins)
+                   for label in set(run_classes.values())}
+    for chunk in pd.read_csv(filename, chunksize=chunksize):
+        labels = chunk['run'].map(run_classes)
+        for label, rows in chunk.groupby(labels):  # Rows of runs without a class have no label and are dropped.
+            aggregators[label].update_from_frame(rows)
+    return aggregators
@@ -1,3 +1,8 @@
+import os
+
+import numpy as np
+
+
 def get_player_actions(monfg):
     """Get the number of actions per player for a given MONFG.
 
@@ -21,3 +26,60 @@ def get_num_objectives(monfg, player=0):
         int: The number of objectives in the game for the given player.
     """
     return monfg[player].shape[-1]
+
+
+def cast_monfg(monfg, dtype):
+    """Cast the payoff matrices of an MONFG to a different type.
+
+    Casting to float32 halves the memory and bandwidth of the payoff matrices. Expected returns are then accumulated in
+    float32, while utilities are still evaluated in float64.
+
+    Players that share a payoff matrix, as in an identity game, also share the cast payoff matrix.
+
+    Args:
+        monfg (List[ndarray]): An MONFG as a list of payoff matrices.
+        dtype (dtype): The type to cast to.
+
+    Returns:
+        List[ndarray]: The MONFG with payoff matrices of the given type.
+    """
+    cast_matrices = {}
+    for payoff_matrix in monfg:
+        if id(payoff_matrix) not in cast_matrices:
+            cast_matrices[id(payoff_matrix)] = payoff_matrix.astype(dtype, copy=False)
+    return [cast_matrices[id(payoff_matrix)] for payoff_matrix in monfg]
+
+
+def save_monfg(monfg, path):
+    """Save an MONFG to a directory with one ``.npy`` file per payoff matrix.
+
+    Args:
+        monfg (List[ndarray]): An MONFG as a list of payoff matrices.
+        path (str): The path to the directory in which the payoff matrices will be saved.
+    """
+    os.makedirs(path, exist_ok=True)
+    for player, payoff_matrix in enumerate(monfg):
+        np.save(f'{path}/payoffs_{player}.npy', payoff_matrix)
+
+
+def load_monfg(path, mmap_mode='r'):
+    """Load an MONFG that was saved with :func:`save_monfg`.
+
+    By default, the payoff matrices are memory-mapped rather than read into memory, so games with payoff tensors that
+    do not fit in memory can still be used. Expected returns are then computed in chunks, see
+    :func:`best_response.calc_expected_returns`.
+
+    Args:
+        path (str): The path to the directory with the payoff matrices.
+        mmap_mode (str, optional): The memory-map mode passed to ``np.load``, or None to read the payoff matrices into
+            memory. (Default value = 'r')
+
+    Returns:
+        List[ndarray]: The MONFG as a list of payoff matrices.
+    """
+    monfg = []
+    player = 0
+    while os.path.exists(f'{path}/payoffs_{player}.npy'):
+        monfg.append(np.load(f'{path}/payoffs_{player}.npy', mmap_mode=mmap_mode))
+        player += 1
+    return monfg
@@ -1,5 +1,5 @@
 import numpy as np
-from jax.nn import softmax
+from scipy.special import softmax
 
 
 def softmax_policy(theta):
@@ -193,7 +193,7 @@ def expand_support_non_support(sup_non_sup):
             expansion = np.array(expansion)
             insert_idx = np.searchsorted(support, expansion)
             expanded_support = tuple(np.insert(support, insert_idx, expansion))
-            reduced_non_support = tuple(np.delete(expansion))
+            reduced_non_support = tuple(np.setdiff1d(non_support, expansion))
             expanded_sup_non_sups.append((expanded_support, reduced_non_support))
 
     return expanded_sup_non_sups